@@ -4,19 +4,74 @@ from discord.ext import commands, tasks
 from discord import app_commands
 import datetime
 import asyncio
+import functools
+import hashlib
+import json
 import re
 import time
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, List, Mapping, Set, Tuple, FrozenSet
+from services import get_firebase_service
 from services.firebase_service import FirebaseService
+from services.config_cache import ConfigCache
 from utils.logging_util import get_logger
 from config.default_config import DEFAULT_CONFIG
 from utils.philippine_holidays import PhilippineHolidays
+from utils.time_util import get_timezone, parse_iso_datetime
 import pytz
 import logging
 
 logger = logging.getLogger(__name__)
 logging.getLogger(__name__).info('dsm.py module imported')
 
+# Minimum seconds between weekly attendance refreshes when participation is unchanged
+WEEKLY_ATTENDANCE_REFRESH_SECONDS = 300
+
+# Quiet period before a burst of participation events is rendered as one embed edit
+DSM_EMBED_DEBOUNCE_SECONDS = 0.5
+
+# Upper bound on messages scanned per get_user_tasks call (Discord pages 100 messages per request)
+USER_TASKS_HISTORY_LIMIT = 2000
+
+# Discord rejects embed field values longer than this
+EMBED_FIELD_VALUE_LIMIT = 1024
+# Discord's cap on an embed description
+EMBED_DESCRIPTION_LIMIT = 4096
+
+# Names of the status embed fields that update_dsm_embed rewrites, keyed as in config['dsm_field_indices']
+DSM_EMBED_FIELD_NAMES = {
+    'participants': "Participants",
+    'participated': "✅ Participated",
+    'pending': "⏳ Pending",
+    'weekly_attendance': "📅 Weekly Attendance",
+}
+
+# Check-ins are accepted until 14h15m after the DSM is posted (11:15 PM for a 9:00 AM start)
+DSM_DEADLINE_OFFSET = datetime.timedelta(hours=14, minutes=15)
+
+# Sample message run through extract_tasks_from_message by /debug_todo
+DEBUG_TODO_TEST_CONTENT = """TODO
+Task 1: Test task
+Task 2: Another test task
+
+Regular message content"""
+
+@functools.lru_cache(maxsize=64)
+def get_dsm_window(last_dsm_time: datetime.datetime, lookback_hours: float) -> Tuple[datetime.datetime, datetime.datetime]:
+    """Return (lookback_time, dsm_deadline) for a DSM, memoized since it only changes with each new DSM."""
+    return last_dsm_time - datetime.timedelta(hours=lookback_hours), last_dsm_time + DSM_DEADLINE_OFFSET
+
+def get_last_dsm_time(config: Mapping[str, Any], now: Optional[datetime.datetime] = None) -> datetime.datetime:
+    """Get the last DSM time from config, or 24 hours before now if none is recorded.
+
+    The fallback is timezone-aware so it compares cleanly with Discord timestamps.
+    """
+    last_dsm_time = config.get('last_dsm_time') if config else None
+    if last_dsm_time:
+        return parse_iso_datetime(last_dsm_time)
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc)
+    return now - datetime.timedelta(days=1)
+
 def admin_required():
     """Decorator to check if user is an admin."""
     async def predicate(interaction: discord.Interaction) -> bool:
@@ -40,40 +95,159 @@ class DSM(commands.Cog):
     def __init__(self, bot: commands.Bot, firebase_service: FirebaseService):
         self.bot = bot
         self.firebase_service = firebase_service
-        self.auto_dsm_task.start()
-        self.log_config_task.start()
+        self.config_cache = ConfigCache(firebase_service, defaults=DEFAULT_CONFIG)
+        # Non-bot members per guild, kept current by the member listeners below.
+        self._human_members: Dict[int, List[discord.Member]] = {}
+        # Human members minus excluded users, keyed by guild with the exclusion set they were built for
+        self._eligible_members: Dict[int, Tuple[FrozenSet[str], List[discord.Member]]] = {}
+        # Integer form of each guild's excluded-user set, keyed the same way
+        self._excluded_int_ids: Dict[int, Tuple[FrozenSet[str], FrozenSet[int]]] = {}
+        # Last rendered DSM embed state per guild (including the embed and resolved participants),
+        # used to skip no-op embed updates and to re-render without refetching the message.
+        self._dsm_embed_state: Dict[int, Dict[str, Any]] = {}
+        # Debounced embed rebuilds per guild; a newer event replaces the pending one.
+        self._pending_embed_updates: Dict[int, asyncio.Task] = {}
+        # DSM channel IDs per guild as last seen by the message listeners, so messages in
+        # other channels are dropped before any config lookup. Entries carry the time they were
+        # taken and expire with the config cache TTL, so channels changed outside the bot are
+        # picked up; commands that change the DSM channels drop the guild's entry at once.
+        self._dsm_channel_ids: Dict[int, Tuple[float, FrozenSet[int]]] = {}
+        # Message events waiting per guild, drained in order by one worker task per guild
+        self._guild_queues: Dict[int, asyncio.Queue] = {}
+        self._guild_workers: Dict[int, asyncio.Task] = {}
+        # Hash of the config last posted by log_config_task, per guild
+        self._last_config_hash: Dict[int, str] = {}
+        # Per-guild tasks sleeping until that guild's next automatic DSM
+        self._auto_dsm_schedules: Dict[int, asyncio.Task] = {}
+        # (timezone, dsm_time) each guild's schedule was built from, so the periodic config
+        # pass can spot a DSM time changed outside the bot and reschedule without extra reads
+        self._auto_dsm_times: Dict[int, Tuple[Any, Any]] = {}
+        # Time of the last automatic DSM each guild's schedule fired for, so the same run can't repeat.
+        # Keyed on the run time, not the date, so moving the DSM later in the day still posts it.
+        self._auto_dsm_fired: Dict[int, datetime.datetime] = {}
+        # Guilds whose scheduled run is posting its DSM right now and must not be cancelled
+        self._auto_dsm_firing: Set[int] = set()
+        # Started in cog_load, once the cog is attached to the running bot
+        self._auto_dsm_startup: Optional[asyncio.Task] = None
         logger.info("DSM cog initialized")
 
+    async def cog_load(self):
+        self._auto_dsm_startup = asyncio.create_task(self.start_auto_dsm_schedules())
+        self.log_config_task.start()
+
     @tasks.loop(minutes=5)
     async def log_config_task(self):
-        """Log configuration to test channel for debugging."""
+        """Log configuration to test channel for debugging when it has changed.
+
+        The same pass reschedules automatic DSMs whose time was changed outside
+        the bot, e.g. directly in Firestore or by another instance.
+        """
         try:
-            for guild in self.bot.guilds:
-                config = await self.firebase_service.get_config(guild.id)
+            guilds = list(self.bot.guilds)
+            configs = await self.config_cache.get_configs(guild.id for guild in guilds)
+            for guild, config in zip(guilds, configs):
                 if not config:
                     continue
+
+                scheduled_times = self._auto_dsm_times.get(guild.id)
+                if scheduled_times is not None and scheduled_times != (config.get('timezone'), config.get('dsm_time')):
+                    await self.schedule_auto_dsm(guild, config)
                     
                 channel_id = config.get('test_channel_id')
                 if not channel_id:
                     continue
+
+                config_hash = hashlib.blake2b(
+                    json.dumps(dict(config), sort_keys=True, default=str).encode(), digest_size=8
+                ).hexdigest()
+                if config_hash == self._last_config_hash.get(guild.id):
+                    continue
                     
                 channel = guild.get_channel(int(channel_id))
                 if channel:
-                    await channel.send(f"Config: {config}")
+                    await channel.send(f"Config: {dict(config)}")
+                    self._last_config_hash[guild.id] = config_hash
                 else:
                     logger.warning(f"Channel not found for guild {guild.id}")
         except Exception as e:
             logger.error(f"Error in log_config_task: {e}")
 
+    async def cog_unload(self):
+        self.log_config_task.cancel()
+        if self._auto_dsm_startup is not None:
+            self._auto_dsm_startup.cancel()
+        for scheduled in self._auto_dsm_schedules.values():
+            scheduled.cancel()
+        for worker in self._guild_workers.values():
+            worker.cancel()
+        # Don't drop participation updates still waiting in the write batcher
+        await self.config_cache.flush_all()
+
+    def get_human_members(self, guild: discord.Guild) -> List[discord.Member]:
+        """Return the cached non-bot members of a guild, building the cache on first use."""
+        members = self._human_members.get(guild.id)
+        if members is None:
+            members = [member for member in guild.members if not member.bot]
+            self._human_members[guild.id] = members
+        return members
+
+    def get_eligible_members(self, guild: discord.Guild, excluded_users: FrozenSet[str]) -> List[discord.Member]:
+        """Return non-bot, non-excluded members, reusing the last list while exclusions are unchanged.
+
+        Pass the excluded-user ID set from config_cache.get_id_set. The returned
+        list is shared; copy it before modifying.
+        """
+        excluded_key = excluded_users
+        cached = self._eligible_members.get(guild.id)
+        if cached is not None and cached[0] == excluded_key:
+            return cached[1]
+        members = [member for member in self.get_human_members(guild) if str(member.id) not in excluded_users]
+        self._eligible_members[guild.id] = (excluded_key, members)
+        return members
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild):
+        self._human_members[guild.id] = [member for member in guild.members if not member.bot]
+        self._eligible_members.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._human_members.pop(guild.id, None)
+        self._eligible_members.pop(guild.id, None)
+        self._excluded_int_ids.pop(guild.id, None)
+        self._dsm_channel_ids.pop(guild.id, None)
+        self._auto_dsm_times.pop(guild.id, None)
+        self._auto_dsm_fired.pop(guild.id, None)
+        scheduled = self._auto_dsm_schedules.pop(guild.id, None)
+        if scheduled is not None:
+            scheduled.cancel()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        if member.bot:
+            return
+        self._eligible_members.pop(member.guild.id, None)
+        members = self._human_members.get(member.guild.id)
+        if members is not None and all(cached.id != member.id for cached in members):
+            members.append(member)
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member):
+        self._eligible_members.pop(member.guild.id, None)
+        # The last render may list this member as a participant
+        self._dsm_embed_state.pop(member.guild.id, None)
+        members = self._human_members.get(member.guild.id)
+        if members is not None:
+            self._human_members[member.guild.id] = [cached for cached in members if cached.id != member.id]
+
     def is_valid_dsm_participation(self, content: str) -> bool:
         """Check if message is valid DSM participation (any non-empty message)."""
         return len(content.strip()) > 0
 
     def extract_tasks_from_message(self, content: str) -> List[str]:
         """Extract tasks from message content. For simplified DSM, just return the whole message as a task."""
-        if content.strip():
-            return [content.strip()]
-        return []
+        stripped = content.strip()
+        return [stripped] if stripped else []
 
     def get_dsm_channel_ids(self, config: Dict[str, Any]) -> List[int]:
         """Return configured DSM channel IDs with backward compatibility for legacy single channel config."""
@@ -97,6 +271,30 @@ class DSM(commands.Cog):
 
         return normalized
 
+    def get_dsm_text_channels(self, guild: discord.Guild, config: Mapping[str, Any]) -> List[discord.TextChannel]:
+        """Resolve the configured DSM channel IDs to text channels that still exist in the guild."""
+        channels: List[discord.TextChannel] = []
+        for channel_id in self.get_dsm_channel_ids(config):
+            channel = guild.get_channel(channel_id)
+            if isinstance(channel, discord.TextChannel):
+                channels.append(channel)
+        return channels
+
+    def is_known_non_dsm_channel(self, guild_id: int, channel_id: int) -> bool:
+        """Check the listener-side channel cache; an empty, missing or expired entry rules nothing out."""
+        entry = self._dsm_channel_ids.get(guild_id)
+        if entry is None:
+            return False
+        seen_at, channel_ids = entry
+        if time.monotonic() - seen_at >= self.config_cache.ttl:
+            del self._dsm_channel_ids[guild_id]
+            return False
+        return bool(channel_ids) and channel_id not in channel_ids
+
+    def remember_dsm_channel_ids(self, guild_id: int, channel_ids: List[int]) -> None:
+        """Record the DSM channels the listeners just read from config."""
+        self._dsm_channel_ids[guild_id] = (time.monotonic(), frozenset(channel_ids))
+
     def is_dsm_channel(self, config: Dict[str, Any], channel_id: int) -> bool:
         """Check whether a channel is one of the configured DSM channels."""
         return channel_id in self.get_dsm_channel_ids(config)
@@ -104,95 +302,124 @@ class DSM(commands.Cog):
     async def get_user_tasks(self, channel: discord.TextChannel, user: discord.Member) -> List[str]:
         """Get tasks for a user from their messages."""
         tasks = []
-        last_dsm_time = None
         
-        # Get the last DSM time from config
-        config = await self.firebase_service.get_config(channel.guild.id)
-        if config and 'last_dsm_time' in config:
-            last_dsm_time = datetime.datetime.fromisoformat(config['last_dsm_time'])
+        # Get the last DSM time from config (24 hours ago if none)
+        config = await self.config_cache.get_config_view(channel.guild.id)
+        last_dsm_time = get_last_dsm_time(config)
         
-        # If no last DSM time, use 24 hours ago
-        if not last_dsm_time:
-            last_dsm_time = datetime.datetime.now() - datetime.timedelta(days=1)
+        # Lookback starts 2 hours before DSM by default; the deadline is 14h15m after DSM creation (11:15 PM)
+        lookback_hours = config.get('dsm_lookback_hours', DEFAULT_CONFIG['dsm_lookback_hours'])
+        lookback_time, dsm_deadline = get_dsm_window(last_dsm_time, lookback_hours)
         
-        # Calculate the lookback time (2 hours before DSM by default)
-        lookback_hours = config.get('dsm_lookback_hours', 2)
-        lookback_time = last_dsm_time - datetime.timedelta(hours=lookback_hours)
+        logger.debug("[get_user_tasks] Looking for messages from %s to %s for user %s", lookback_time, dsm_deadline, user.display_name)
+        logger.debug("[get_user_tasks] Lookback period: %s to %s", lookback_time, last_dsm_time)
+        logger.debug("[get_user_tasks] DSM period: %s to %s", last_dsm_time, dsm_deadline)
         
-        # Calculate the DSM deadline (14 hours 15 minutes after DSM creation - 11:15 PM)
-        dsm_deadline = last_dsm_time + datetime.timedelta(hours=14, minutes=15)
-        
-        logger.info(f"[get_user_tasks] Looking for messages from {lookback_time} to {dsm_deadline} for user {user.display_name}")
-        logger.info(f"[get_user_tasks] Lookback period: {lookback_time} to {last_dsm_time}")
-        logger.info(f"[get_user_tasks] DSM period: {last_dsm_time} to {dsm_deadline}")
-        
-        # Get messages from both lookback period and DSM period
-        async for message in channel.history(after=lookback_time, before=dsm_deadline + datetime.timedelta(seconds=1), limit=None):
+        # Get messages from both lookback period and DSM period. The after/before bounds
+        # already cover both windows, so messages need no per-item time check.
+        async for message in channel.history(
+            after=lookback_time,
+            before=dsm_deadline + datetime.timedelta(seconds=1),
+            limit=USER_TASKS_HISTORY_LIMIT,
+            oldest_first=True,
+        ):
             if message.author.id == user.id:
-                # Check if message is within acceptable time windows
-                in_lookback_period = lookback_time <= message.created_at < last_dsm_time
-                in_dsm_period = last_dsm_time <= message.created_at <= dsm_deadline
-                
-                if in_lookback_period or in_dsm_period:
-                    message_tasks = self.extract_tasks_from_message(message.content)
-                    tasks.extend(message_tasks)
-                    logger.info(f"[get_user_tasks] Found {len(message_tasks)} tasks in message {message.id} (lookback: {in_lookback_period}, DSM: {in_dsm_period})")
+                message_tasks = self.extract_tasks_from_message(message.content)
+                tasks.extend(message_tasks)
+                logger.debug("[get_user_tasks] Found %d tasks in message %s", len(message_tasks), message.id)
         
-        return list(set(tasks))  # Remove duplicates
+        return list(dict.fromkeys(tasks))  # Remove duplicates, keeping the order they were posted
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        logger.info(f"[on_message] Received message from {message.author} in channel {getattr(message.channel, 'name', None)}: {repr(message.content)}")
+        logger.debug("[on_message] Received message from %s in channel %s: %r", message.author, getattr(message.channel, 'name', None), message.content)
         if message.author.bot or not message.guild:
-            logger.info("[on_message] Ignored bot or non-guild message.")
+            logger.debug("[on_message] Ignored bot or non-guild message.")
+            return
+        if self.is_known_non_dsm_channel(message.guild.id, message.channel.id):
             return
-        config = await self.firebase_service.get_config(message.guild.id)
+        config = await self.config_cache.get_config_view(message.guild.id)
         dsm_channel_ids = self.get_dsm_channel_ids(config)
+        self.remember_dsm_channel_ids(message.guild.id, dsm_channel_ids)
 
         if dsm_channel_ids and message.channel.id not in dsm_channel_ids:
-            logger.info(f"[on_message] Ignored message not in DSM channels (expected one of {dsm_channel_ids}).")
+            logger.debug("[on_message] Ignored message not in DSM channels (expected one of %s).", dsm_channel_ids)
             return
 
         # Update DSM participation tracking
-        print(f"[on_message] Processing message in DSM channel. Author: {message.author}")
-        logger.info(f"[on_message] Processing message in DSM channel. Author: {message.author}")
+        logger.info("[on_message] Processing message in DSM channel. Author: %s", message.author)
 
         # Update participation tracking
-        await self.update_dsm_participation(message.guild, message.channel, message)
+        self.enqueue_participation_update(message.guild, message.channel, message)
         
         await self.bot.process_commands(message)
 
     @commands.Cog.listener()
     async def on_message_edit(self, before, after):
-        logger.info(f"[on_message_edit] Message edited by {after.author} in channel {getattr(after.channel, 'name', None)}: {repr(after.content)}")
+        logger.debug("[on_message_edit] Message edited by %s in channel %s: %r", after.author, getattr(after.channel, 'name', None), after.content)
         if after.author.bot or not after.guild:
-            logger.info("[on_message_edit] Ignored bot or non-guild message.")
+            logger.debug("[on_message_edit] Ignored bot or non-guild message.")
             return
-        config = await self.firebase_service.get_config(after.guild.id)
+        if self.is_known_non_dsm_channel(after.guild.id, after.channel.id):
+            return
+        config = await self.config_cache.get_config_view(after.guild.id)
         dsm_channel_ids = self.get_dsm_channel_ids(config)
+        self.remember_dsm_channel_ids(after.guild.id, dsm_channel_ids)
 
         if dsm_channel_ids and after.channel.id not in dsm_channel_ids:
-            logger.info(f"[on_message_edit] Ignored message not in DSM channels (expected one of {dsm_channel_ids}).")
+            logger.debug("[on_message_edit] Ignored message not in DSM channels (expected one of %s).", dsm_channel_ids)
             return
         # Only update the TODO TASKS for Today embed
-        await self.update_dsm_participation(after.guild, after.channel, after)
+        self.enqueue_participation_update(after.guild, after.channel, after)
 
     @commands.Cog.listener()
     async def on_message_delete(self, message):
-        logger.info(f"[on_message_delete] Message deleted by {message.author if message.author else 'Unknown'} in channel {getattr(message.channel, 'name', None)}: {repr(message.content) if hasattr(message, 'content') else 'No content'}")
+        logger.debug("[on_message_delete] Message deleted by %s in channel %s: %r", message.author or 'Unknown', getattr(message.channel, 'name', None), getattr(message, 'content', 'No content'))
         if not message.guild or message.author is None or message.author.bot:
             return
-        config = await self.firebase_service.get_config(message.guild.id)
+        if self.is_known_non_dsm_channel(message.guild.id, message.channel.id):
+            return
+        config = await self.config_cache.get_config_view(message.guild.id)
         dsm_channel_ids = self.get_dsm_channel_ids(config)
+        self.remember_dsm_channel_ids(message.guild.id, dsm_channel_ids)
 
         if dsm_channel_ids and message.channel.id not in dsm_channel_ids:
             return
         # Only update the TODO TASKS for Today embed
-        await self.update_dsm_participation(message.guild, message.channel, message, deleted=True)
+        self.enqueue_participation_update(message.guild, message.channel, message, deleted=True)
+
+    def enqueue_participation_update(self, guild, channel, message, deleted=False) -> None:
+        """Queue a message event for the guild's worker so the listener can return at once.
+
+        Events for one guild are applied in arrival order, so each sees the
+        participation recorded by the one before it.
+        """
+        queue = self._guild_queues.get(guild.id)
+        if queue is None:
+            queue = self._guild_queues[guild.id] = asyncio.Queue()
+        queue.put_nowait((channel, message, deleted))
+        worker = self._guild_workers.get(guild.id)
+        if worker is None or worker.done():
+            self._guild_workers[guild.id] = asyncio.create_task(self._drain_guild_queue(guild))
+
+    async def _drain_guild_queue(self, guild) -> None:
+        queue = self._guild_queues[guild.id]
+        while not queue.empty():
+            channel, message, deleted = queue.get_nowait()
+            try:
+                await self.update_dsm_participation(guild, channel, message, deleted=deleted)
+            except Exception as e:
+                logger.error(f"Error updating DSM participation in guild {guild.id}: {e}")
 
-    async def update_dsm_participation(self, guild, channel, message, deleted=False):
-        """Track DSM participation and weekly attendance."""
-        config = await self.firebase_service.get_config(guild.id)
+    async def update_dsm_participation(self, guild, channel, message, deleted=False, config=None):
+        """Track DSM participation and weekly attendance.
+
+        Callers may pass a writable copy of a config they already loaded.
+        Queued message events load it when they run, after the previous event
+        for the guild has been applied.
+        """
+        if config is None:
+            config = await self.config_cache.get_config(guild.id)
 
         user_id = str(message.author.id)
         message_time = message.created_at
@@ -202,7 +429,7 @@ class DSM(commands.Cog):
         weekly_attendance = config.get('weekly_attendance', {})
         
         # Convert message time to guild timezone for proper date calculation
-        timezone = await self.get_guild_timezone(guild.id)
+        timezone = await self.get_guild_timezone(guild.id, config)
         participation_datetime = message_time.astimezone(timezone)
         participation_date = participation_datetime.date()
         user_weekly_key = f"{user_id}_{participation_date.strftime('%Y-%W')}"
@@ -234,8 +461,12 @@ class DSM(commands.Cog):
         
         config['dsm_participants'] = dsm_participants
         config['weekly_attendance'] = weekly_attendance
-        await self.firebase_service.update_config(guild.id, config)
-        await self.update_dsm_embed(guild, channel, config)
+        # Coalesce per-message writes; only the two participation fields change here
+        self.config_cache.schedule_update(guild.id, {
+            'dsm_participants': dsm_participants,
+            'weekly_attendance': weekly_attendance,
+        })
+        self.schedule_dsm_embed_update(guild, channel, config)
 
     async def mark_command_participation(self, interaction: discord.Interaction, config: dict) -> bool:
         """Mark participation when a user runs a slash/prefix command in the DSM channel."""
@@ -249,11 +480,11 @@ class DSM(commands.Cog):
             if int(interaction.channel_id) not in dsm_channel_ids:
                 return False
 
-            now_utc = datetime.datetime.utcnow().replace(tzinfo=pytz.UTC)
+            now_utc = datetime.datetime.now(pytz.UTC)
             weekly_attendance = config.get('weekly_attendance', {})
             dsm_participants = config.get('dsm_participants', {})
             user_id = str(interaction.user.id)
-            timezone = await self.get_guild_timezone(interaction.guild_id)
+            timezone = await self.get_guild_timezone(interaction.guild_id, config)
             participation_datetime = now_utc.astimezone(timezone)
             participation_date = participation_datetime.date()
             week_key = participation_date.strftime('%Y-%W')
@@ -269,16 +500,47 @@ class DSM(commands.Cog):
                 weekly_attendance[user_weekly_key][day_abbrev] = True
             config['dsm_participants'] = dsm_participants
             config['weekly_attendance'] = weekly_attendance
-            await self.firebase_service.update_config(interaction.guild_id, config)
+            self.config_cache.schedule_update(interaction.guild_id, {
+                'dsm_participants': dsm_participants,
+                'weekly_attendance': weekly_attendance,
+            })
             channel = interaction.channel
             if isinstance(channel, discord.TextChannel):
-                await self.update_dsm_embed(interaction.guild, channel, config)
-            logger.info(f"[mark_command_participation] Counted command participation for user {interaction.user.id}")
+                self.schedule_dsm_embed_update(interaction.guild, channel, config)
+            logger.debug("[mark_command_participation] Counted command participation for user %s", interaction.user.id)
             return True
         except Exception as e:
             logger.error(f"Error marking command participation: {e}")
             return False
 
+    async def optimistic_update(self, interaction: discord.Interaction,
+                                mutator: Callable[[Mapping[str, Any]], Dict[str, Any]]) -> Optional[asyncio.Task]:
+        """Apply a config change locally and write it to Firestore in the background.
+
+        mutator receives the cached config and returns the fields to update, or
+        an empty dict when nothing changes. It runs without awaiting anything
+        after the read, so two commands editing the same field can't lose each
+        other's change. The caller can answer right away; if the write fails
+        the user gets a follow-up warning.
+        """
+        config = await self.config_cache.get_config_view(interaction.guild_id)
+        updates = mutator(config)
+        if not updates:
+            return None
+        task = self.config_cache.write_behind(interaction.guild_id, updates)
+        task.add_done_callback(functools.partial(self._warn_on_failed_write, interaction))
+        return task
+
+    def _warn_on_failed_write(self, interaction: discord.Interaction, task: asyncio.Task) -> None:
+        """Tell the user when a background config write was rejected."""
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(f"Error saving config for guild {interaction.guild_id}: {task.exception()}")
+        asyncio.create_task(interaction.followup.send(
+            "Your last change could not be saved. Please try again.",
+            ephemeral=True
+        ))
+
     # Removed update_todo_tasks_embed function as it's no longer needed with simplified DSM
 
     async def create_dsm(self, channel: discord.TextChannel, config: dict, is_automatic: bool = True):
@@ -288,12 +550,7 @@ class DSM(commands.Cog):
             if not dsm_channel_ids:
                 raise ValueError("No DSM channels configured. Use /set_channel or /add_dsm_channel first.")
 
-            dsm_channels: List[discord.TextChannel] = []
-            for channel_id in dsm_channel_ids:
-                guild_channel = channel.guild.get_channel(channel_id)
-                if isinstance(guild_channel, discord.TextChannel):
-                    dsm_channels.append(guild_channel)
-
+            dsm_channels = self.get_dsm_text_channels(channel.guild, config)
             if not dsm_channels:
                 raise ValueError("Configured DSM channels were not found in this guild.")
 
@@ -307,24 +564,20 @@ class DSM(commands.Cog):
                 except (TypeError, ValueError):
                     logger.warning(f"Invalid status channel ID format: {status_channel_id}. Falling back to provided channel.")
 
-            timezone = await self.get_guild_timezone(channel.guild.id)
+            timezone = await self.get_guild_timezone(channel.guild.id, config)
             current_time = datetime.datetime.now(timezone)
             end_time = current_time + datetime.timedelta(hours=8)
-            deadline_time = current_time + datetime.timedelta(hours=14, minutes=15)  # 11:15 PM for 9:00 AM start
+            deadline_time = current_time + DSM_DEADLINE_OFFSET
 
-            excluded_users = set(self.ensure_str_ids(config.get('excluded_users', [])))
-            logger.info(f"[DEBUG] Creating DSM with excluded users: {excluded_users}")
-            last_dsm_time = config.get('last_dsm_time')
-            if last_dsm_time:
-                last_dsm_time = datetime.datetime.fromisoformat(last_dsm_time)
-            else:
-                last_dsm_time = current_time - datetime.timedelta(days=1)
+            excluded_users = await self.config_cache.get_id_set(channel.guild.id, 'excluded_users')
+            logger.debug("[create_dsm] Creating DSM with excluded users: %s", sorted(excluded_users))
+            last_dsm_time = get_last_dsm_time(config, current_time)
 
             # Calculate the lookback time (2 hours before last DSM by default)
-            lookback_hours = config.get('dsm_lookback_hours', 2)
+            lookback_hours = config.get('dsm_lookback_hours', DEFAULT_CONFIG['dsm_lookback_hours'])
             lookback_time = last_dsm_time - datetime.timedelta(hours=lookback_hours)
             
-            logger.info(f"[create_dsm] Gathering TODOs from {lookback_time} to {current_time}")
+            logger.debug("[create_dsm] Gathering TODOs from %s to %s", lookback_time, current_time)
 
             # No need to gather yesterday's tasks since we simplified the DSM
 
@@ -351,17 +604,16 @@ class DSM(commands.Cog):
                 inline=False
             )
             
-            # Send DSM prompt to each configured DSM channel.
-            for dsm_channel in dsm_channels:
-                await dsm_channel.send(embed=embed)
-
-            # Post the status embed in the dedicated status channel.
-            dsm_message = await status_channel.send(embed=embed)
+            # Send the DSM prompt to every configured DSM channel and the status embed to the
+            # dedicated status channel concurrently instead of one round-trip at a time.
+            *_, dsm_message = await asyncio.gather(
+                *(dsm_channel.send(embed=embed) for dsm_channel in dsm_channels),
+                status_channel.send(embed=embed),
+            )
             config['last_dsm_time'] = dsm_message.created_at.isoformat()
             
             # Initialize participation tracking
-            all_members = [member for member in channel.guild.members 
-                          if not member.bot and member.id not in excluded_users]
+            all_members = self.get_eligible_members(channel.guild, excluded_users)
             pending_users = all_members.copy()
             participants_line = f"👥 Total: {len(all_members)}  ✅ Participated: 0  ⏳ Pending: {len(pending_users)}"
 
@@ -377,7 +629,7 @@ class DSM(commands.Cog):
             )
             embed.add_field(
                 name="⏳ Pending",
-                value="\n".join([member.mention for member in pending_users]) if pending_users else "None",
+                value=self.format_mention_list(pending_users),
                 inline=False
             )
 
@@ -394,19 +646,43 @@ class DSM(commands.Cog):
             # Edit the DSM embed to add all fields
             await dsm_message.edit(embed=embed)
 
+            # Seed the render state with what was just sent, so the first participation
+            # update edits this embed in place instead of fetching the message back.
+            self._dsm_embed_state[channel.guild.id] = {
+                'message_id': dsm_message.id,
+                'participants': frozenset(),
+                'excluded': excluded_users,
+                'rendered_at': time.monotonic(),
+                'rendered_values': None,
+                'embed': embed,
+                'participated': (),
+                'pending': tuple(pending_users),
+                'all_members': all_members,
+            }
+
+            # Remember where each managed field sits so updates can set them in place
+            config['dsm_field_indices'] = self.locate_dsm_embed_fields(embed.fields)
+
             config['current_dsm_message_id'] = str(dsm_message.id)
             config['current_dsm_channel_id'] = str(status_channel.id)
             config['dsm_participants'] = {}  # Reset for new DSM
             
             # Initialize weekly attendance for today
             today = current_time.date()
+            weekly_attendance = config.setdefault('weekly_attendance', {})
             for member in all_members:
                 user_weekly_key = f"{member.id}_{today.strftime('%Y-%W')}"
-                if 'weekly_attendance' not in config:
-                    config['weekly_attendance'] = {}
-                if user_weekly_key not in config['weekly_attendance']:
-                    config['weekly_attendance'][user_weekly_key] = {'M': False, 'T': False, 'W': False, 'Th': False, 'F': False}
-            await self.firebase_service.update_config(channel.guild.id, config)
+                if user_weekly_key not in weekly_attendance:
+                    weekly_attendance[user_weekly_key] = {'M': False, 'T': False, 'W': False, 'Th': False, 'F': False}
+            # Write only the fields set above, so defaults filled in by the cache stay out of Firestore
+            await self.config_cache.update_config(channel.guild.id, {
+                'last_dsm_time': config['last_dsm_time'],
+                'dsm_field_indices': config['dsm_field_indices'],
+                'current_dsm_message_id': config['current_dsm_message_id'],
+                'current_dsm_channel_id': config['current_dsm_channel_id'],
+                'dsm_participants': config['dsm_participants'],
+                'weekly_attendance': weekly_attendance,
+            })
             logger.info(f"Created DSM prompts in {[ch.name for ch in dsm_channels]} with status in {status_channel.name}")
         except Exception as e:
             logger.error(f"Error creating DSM: {str(e)}")
@@ -425,7 +701,8 @@ class DSM(commands.Cog):
             return True
         
         # Check manual skip dates
-        skipped_dates = config.get('skipped_dates', [])
+        # A map lookup; the legacy list shape still answers `in` correctly
+        skipped_dates = config.get('skipped_dates') or {}
         date_str = date.strftime('%Y-%m-%d')
         if date_str in skipped_dates:
             return True
@@ -476,94 +753,185 @@ class DSM(commands.Cog):
         
         return "```\n" + "\n".join(table_lines) + "\n```" if table_lines else ""
 
+    def format_mention_list(self, members) -> str:
+        """Mention members one per line, collapsing the tail so the text fits in an embed field."""
+        mentions = [member.mention for member in members]
+        text = "\n".join(mentions)
+        if len(text) <= EMBED_FIELD_VALUE_LIMIT:
+            return text or "None"
+
+        # Keep whole lines, leaving room for the "(+N more)" line
+        reserve = len(f"\n…(+{len(mentions)} more)")
+        kept, length = 0, 0
+        for mention in mentions:
+            if length + len(mention) + 1 > EMBED_FIELD_VALUE_LIMIT - reserve:
+                break
+            length += len(mention) + 1
+            kept += 1
+        return "\n".join(mentions[:kept]) + f"\n…(+{len(mentions) - kept} more)"
+
+    def locate_dsm_embed_fields(self, fields) -> Dict[str, int]:
+        """Map each managed DSM embed field present in fields to its index."""
+        keys_by_name = {name: key for key, name in DSM_EMBED_FIELD_NAMES.items()}
+        return {keys_by_name[field.name]: index for index, field in enumerate(fields) if field.name in keys_by_name}
+
+    def schedule_dsm_embed_update(self, guild, channel, config) -> None:
+        """Coalesce bursts of participation events into a single embed edit per guild."""
+        pending = self._pending_embed_updates.get(guild.id)
+        if pending is not None and not pending.done():
+            pending.cancel()
+        self._pending_embed_updates[guild.id] = asyncio.create_task(
+            self._debounced_dsm_embed_update(guild, channel, config)
+        )
+
+    async def _debounced_dsm_embed_update(self, guild, channel, config) -> None:
+        await asyncio.sleep(DSM_EMBED_DEBOUNCE_SECONDS)
+        await self.update_dsm_embed(guild, channel, config)
+
     async def update_dsm_embed(self, guild, channel, config=None):
         """Update the DSM embed with current participation and weekly attendance."""
         if config is None:
-            config = await self.firebase_service.get_config(guild.id)
+            config = await self.config_cache.get_config(guild.id)
         current_dsm_message_id = config.get('current_dsm_message_id')
         if not current_dsm_message_id:
             return
         try:
             # Convert string message ID to int
             current_dsm_message_id = int(current_dsm_message_id)
-            dsm_message = await channel.fetch_message(current_dsm_message_id)
-            last_dsm_time = config.get('last_dsm_time')
-            if last_dsm_time:
-                last_dsm_time = datetime.datetime.fromisoformat(last_dsm_time)
-            else:
-                last_dsm_time = datetime.datetime.now() - datetime.timedelta(days=1)
 
-            # Get current excluded users
-            excluded_users = set(self.ensure_str_ids(config.get('excluded_users', [])))
+            # Get current excluded users; the cached frozenset is shared across renders
+            excluded_users = await self.config_cache.get_id_set(guild.id, 'excluded_users')
             
             # Get participation data
             dsm_participants = config.get('dsm_participants', {})
+
+            # Skip the fetch and edit when nobody joined or left since the last render,
+            # unless the weekly attendance table is due for a refresh.
+            embed_state = {
+                'message_id': current_dsm_message_id,
+                'participants': frozenset(dsm_participants),
+                'excluded': excluded_users,
+            }
+            previous_state = self._dsm_embed_state.get(guild.id)
+            if previous_state is not None:
+                unchanged = all(previous_state[key] == value for key, value in embed_state.items())
+                if unchanged and time.monotonic() - previous_state['rendered_at'] < WEEKLY_ATTENDANCE_REFRESH_SECONDS:
+                    return
+
+            # Reuse the last render for the same message and exclusions: its embed saves the
+            # fetch, and only participants added since then need resolving.
+            reusable_state = None
+            if (previous_state is not None
+                    and previous_state['message_id'] == current_dsm_message_id
+                    and previous_state['excluded'] == embed_state['excluded']
+                    and previous_state['participants'] <= embed_state['participants']):
+                reusable_state = previous_state
+
+            if reusable_state is not None:
+                dsm_message = channel.get_partial_message(current_dsm_message_id)
+                embed = reusable_state['embed']
+                participated_users = list(reusable_state['participated'])
+                new_participants = embed_state['participants'] - reusable_state['participants']
+            else:
+                # The DSM message was posted by this bot, so it is usually still in the message cache
+                dsm_message = discord.utils.get(self.bot.cached_messages, id=current_dsm_message_id)
+                if dsm_message is None:
+                    dsm_message = await channel.fetch_message(current_dsm_message_id)
+                embed = dsm_message.embeds[0]
+                participated_users = []
+                new_participants = dsm_participants
+            last_dsm_time = get_last_dsm_time(config)
             
             # Get all eligible members
-            all_members = [member for member in guild.members 
-                          if not member.bot and str(member.id) not in excluded_users]
+            all_members = self.get_eligible_members(guild, excluded_users)
             
             # Separate participated and pending users
-            participated_users = []
-            participated_user_ids = set()
+            participated_user_ids = {member.id for member in participated_users}
             
-            logger.info(f"[DEBUG] Processing {len(dsm_participants)} participants from config")
+            logger.debug("[update_dsm_embed] Processing %d of %d participants from config", len(new_participants), len(dsm_participants))
             
-            for user_id in dsm_participants:
+            for user_id in new_participants:
                 try:
                     # Handle both string and int user IDs
                     member_id = int(user_id)
                     member = guild.get_member(member_id)
-                    if member and member in all_members:
+                    # Same predicate as all_members, checked in O(1) instead of a list scan
+                    if member and not member.bot and str(member_id) not in excluded_users:
                         participated_users.append(member)
                         participated_user_ids.add(member_id)
-                        logger.info(f"[DEBUG] Added participant: {member.display_name} (ID: {member_id})")
+                        logger.debug("[update_dsm_embed] Added participant: %s (ID: %s)", member.display_name, member_id)
                     else:
-                        logger.warning(f"[DEBUG] Member not found or excluded: {member_id}")
+                        logger.debug("[update_dsm_embed] Member not found or excluded: %s", member_id)
                 except (ValueError, TypeError):
                     logger.warning(f"Invalid user ID in dsm_participants: {user_id}")
                     continue
             
-            # Remove participated users from all_members to get pending users
-            pending_users = [member for member in all_members if member.id not in participated_user_ids]
+            # Remove participated users to get pending users. While the eligible member list is the
+            # same object as last render, only the previous pending list needs filtering.
+            if reusable_state is not None and reusable_state.get('all_members') is all_members:
+                pending_users = [member for member in reusable_state['pending'] if member.id not in participated_user_ids]
+            else:
+                pending_users = [member for member in all_members if member.id not in participated_user_ids]
             
-            logger.info(f"[DEBUG] Final counts - Participated: {len(participated_users)}, Pending: {len(pending_users)}, Total: {len(all_members)}")
+            logger.debug("[update_dsm_embed] Final counts - Participated: %d, Pending: %d, Total: %d", len(participated_users), len(pending_users), len(all_members))
 
             # Update the embed
-            embed = dsm_message.embeds[0]
             participants_line = f"👥 Total: {len(all_members)}  ✅ Participated: {len(participated_users)}  ⏳ Pending: {len(pending_users)}"
             
-            # Update the Participants field
-            for i, field in enumerate(embed.fields):
-                if field.name == "Participants":
-                    embed.set_field_at(i, name="Participants", value=participants_line, inline=False)
-                    break
-
             # Update the Participated and Pending fields
-            participated_list = "\n".join([user.mention for user in participated_users]) if participated_users else "None"
-            pending_list = "\n".join([user.mention for user in pending_users]) if pending_users else "None"
-
-            for i, field in enumerate(embed.fields):
-                if field.name == "✅ Participated":
-                    embed.set_field_at(i, name="✅ Participated", value=participated_list, inline=False)
-                elif field.name == "⏳ Pending":
-                    embed.set_field_at(i, name="⏳ Pending", value=pending_list, inline=False)
-                elif field.name == "📅 Weekly Attendance":
-                    # Update weekly attendance display with proper timezone
-                    timezone = await self.get_guild_timezone(guild.id)
-                    timezone_aware_dsm_time = last_dsm_time.astimezone(timezone)
-                    weekly_attendance_text = self.get_weekly_attendance_display(config, all_members, timezone_aware_dsm_time.date(), timezone_aware_dsm_time)
-                    if weekly_attendance_text:
-                        embed.set_field_at(i, name="📅 Weekly Attendance", value=weekly_attendance_text, inline=False)
+            participated_list = self.format_mention_list(participated_users)
+            pending_list = self.format_mention_list(pending_users)
 
-            await dsm_message.edit(embed=embed)
-            logger.info(f"[DEBUG] Updated DSM embed with {len(participated_users)} participated users and {len(pending_users)} pending users")
+            updated_values = {
+                'participants': participants_line,
+                'participated': participated_list,
+                'pending': pending_list,
+            }
+
+            fields = embed.fields
+            field_indices = config.get('dsm_field_indices') or {}
+            # Use the indices recorded by create_dsm when they still match the message;
+            # older DSM messages locate the fields in a single pass instead.
+            indices_match = bool(field_indices) and all(
+                0 <= index < len(fields) and fields[index].name == DSM_EMBED_FIELD_NAMES.get(key)
+                for key, index in field_indices.items()
+            )
+            if not indices_match:
+                field_indices = self.locate_dsm_embed_fields(fields)
+
+            if 'weekly_attendance' in field_indices:
+                # Update weekly attendance display with proper timezone
+                timezone = await self.get_guild_timezone(guild.id, config)
+                timezone_aware_dsm_time = last_dsm_time.astimezone(timezone)
+                weekly_attendance_text = self.get_weekly_attendance_display(config, all_members, timezone_aware_dsm_time.date(), timezone_aware_dsm_time)
+                if weekly_attendance_text:
+                    updated_values['weekly_attendance'] = weekly_attendance_text
+
+            # Fields we don't manage (e.g. Timeline) are left as-is
+            for key, value in updated_values.items():
+                if key in field_indices:
+                    embed.set_field_at(field_indices[key], name=DSM_EMBED_FIELD_NAMES[key], value=value, inline=False)
+
+            # Each edit is a rate-limited REST call; skip it when the rendered text is what the message already shows
+            rendered_values = tuple(sorted(updated_values.items()))
+            if (previous_state is not None
+                    and previous_state['message_id'] == current_dsm_message_id
+                    and previous_state.get('rendered_values') == rendered_values):
+                logger.debug("[update_dsm_embed] Embed content unchanged; skipping edit")
+            else:
+                await dsm_message.edit(embed=embed)
+            embed_state['rendered_values'] = rendered_values
+            embed_state['rendered_at'] = time.monotonic()
+            embed_state['embed'] = embed
+            embed_state['participated'] = tuple(participated_users)
+            embed_state['pending'] = tuple(pending_users)
+            embed_state['all_members'] = all_members
+            self._dsm_embed_state[guild.id] = embed_state
+            logger.debug("[update_dsm_embed] Updated DSM embed with %d participated users and %d pending users", len(participated_users), len(pending_users))
 
         except (ValueError, TypeError) as e:
-            print(f"[update_dsm_embed] Invalid DSM message ID format: {current_dsm_message_id}")
             logger.error(f"[update_dsm_embed] Invalid DSM message ID format: {current_dsm_message_id}")
         except Exception as e:
-            print(f"[update_dsm_embed] Error updating DSM embed: {e}")
             logger.error(f"[update_dsm_embed] Error updating DSM embed: {e}")
 
     @app_commands.command(name="remind", description="Manually send a DSM reminder to everyone")
@@ -571,28 +939,24 @@ class DSM(commands.Cog):
         if not interaction.guild_id:
             await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
             return
-        config = await self.firebase_service.get_config(interaction.guild_id)
+        # Acknowledge before the config read and channel sends so the 3-second deadline can't lapse
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        config = await self.config_cache.get_config(interaction.guild_id)
         # Mark participation if run in DSM channel during active window
         await self.mark_command_participation(interaction, config)
         dsm_channel_ids = self.get_dsm_channel_ids(config)
         if not dsm_channel_ids:
-            await interaction.response.send_message("No DSM channel is set.", ephemeral=True)
+            await interaction.followup.send("No DSM channel is set.", ephemeral=True)
             return
 
-        channels: List[discord.TextChannel] = []
-        for channel_id in dsm_channel_ids:
-            channel = interaction.guild.get_channel(channel_id)
-            if isinstance(channel, discord.TextChannel):
-                channels.append(channel)
-
+        channels = self.get_dsm_text_channels(interaction.guild, config)
         if not channels:
-            await interaction.response.send_message("Configured DSM channels were not found.", ephemeral=True)
+            await interaction.followup.send("Configured DSM channels were not found.", ephemeral=True)
             return
 
-        for channel in channels:
-            await self.send_dsm_reminder(channel, config)
+        await asyncio.gather(*(self.send_dsm_reminder(channel, config) for channel in channels))
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             f"Reminder sent to {len(channels)} DSM channel(s).",
             ephemeral=True
         )
@@ -604,16 +968,15 @@ class DSM(commands.Cog):
             if not interaction.guild_id:
                 await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
                 return
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             if not config:
                 config = {}
 
-            admin_users = set(config.get('admin_users', []))
-            admin_users.add(user.id)
-            
-            config['admin_users'] = list(admin_users)
-            await self.firebase_service.update_config(interaction.guild_id, config)
+            admin_ids = await self.config_cache.get_id_set(interaction.guild_id, 'admin_users')
+            if str(user.id) not in admin_ids:
+                config['admin_users'] = list(config.get('admin_users') or []) + [user.id]
+                await self.config_cache.update_config(interaction.guild_id, {'admin_users': config['admin_users']})
             
             await interaction.response.send_message(
                 f"{user.mention} has been added as an admin.",
@@ -635,16 +998,15 @@ class DSM(commands.Cog):
             if not interaction.guild_id:
                 await interaction.response.send_message("This command can only be used in a server.", ephemeral=True)
                 return
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             if not config:
                 config = {}
 
-            admin_users = set(config.get('admin_users', []))
-            if user.id in admin_users:
-                admin_users.remove(user.id)
-                config['admin_users'] = list(admin_users)
-                await self.firebase_service.update_config(interaction.guild_id, config)
+            admin_ids = await self.config_cache.get_id_set(interaction.guild_id, 'admin_users')
+            if str(user.id) in admin_ids:
+                config['admin_users'] = [admin_id for admin_id in config.get('admin_users') or [] if str(admin_id) != str(user.id)]
+                await self.config_cache.update_config(interaction.guild_id, {'admin_users': config['admin_users']})
                 
                 await interaction.response.send_message(
                     f"{user.mention} has been removed as an admin.",
@@ -676,7 +1038,7 @@ class DSM(commands.Cog):
             if not interaction.response.is_done():
                 await interaction.response.defer(ephemeral=True)
 
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             admin_users = config.get('admin_users', [])
             
@@ -730,12 +1092,12 @@ class DSM(commands.Cog):
         try:
             # Defer the response to prevent timeout
             await interaction.response.defer(ephemeral=True)
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             if not config:
                 config = {}
             
-            lookback_hours = config.get('dsm_lookback_hours', 2)
+            lookback_hours = config.get('dsm_lookback_hours', DEFAULT_CONFIG['dsm_lookback_hours'])
             last_dsm_time = config.get('last_dsm_time')
             
             embed = discord.Embed(
@@ -751,25 +1113,29 @@ class DSM(commands.Cog):
             )
             
             if last_dsm_time:
-                last_dsm_dt = datetime.datetime.fromisoformat(last_dsm_time)
-                lookback_time = last_dsm_dt - datetime.timedelta(hours=lookback_hours)
-                dsm_deadline = last_dsm_dt + datetime.timedelta(hours=14, minutes=15)
+                last_dsm_dt = parse_iso_datetime(last_dsm_time)
+                lookback_time, dsm_deadline = get_dsm_window(last_dsm_dt, lookback_hours)
+
+                # Format each timestamp once; isoformat matches '%Y-%m-%d %H:%M:%S' here
+                last_dsm_str = last_dsm_dt.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+                lookback_str = lookback_time.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+                deadline_str = dsm_deadline.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
                 
                 embed.add_field(
                     name="Last DSM Time",
-                    value=f"**{last_dsm_dt.strftime('%Y-%m-%d %H:%M:%S')}**",
+                    value=f"**{last_dsm_str}**",
                     inline=True
                 )
                 
                 embed.add_field(
                     name="Lookback Period",
-                    value=f"**{lookback_time.strftime('%Y-%m-%d %H:%M:%S')}** to **{last_dsm_dt.strftime('%Y-%m-%d %H:%M:%S')}**\n(Early submissions)",
+                    value=f"**{lookback_str}** to **{last_dsm_str}**\n(Early submissions)",
                     inline=True
                 )
                 
                 embed.add_field(
                     name="DSM Period",
-                    value=f"**{last_dsm_dt.strftime('%Y-%m-%d %H:%M:%S')}** to **{dsm_deadline.strftime('%Y-%m-%d %H:%M:%S')}**\n(During DSM)",
+                    value=f"**{last_dsm_str}** to **{deadline_str}**\n(During DSM)",
                     inline=True
                 )
                 
@@ -802,10 +1168,10 @@ class DSM(commands.Cog):
 
     async def send_dsm_reminder(self, channel, config):
         # Compose the pre-DSM reminder message
-        timezone = await self.get_guild_timezone(channel.guild.id)
+        timezone = await self.get_guild_timezone(channel.guild.id, config)
         
         # Get configured DSM time (default 09:00)
-        dsm_time_str = config.get('dsm_time', '09:00')
+        dsm_time_str = config.get('dsm_time', DEFAULT_CONFIG['dsm_time'])
         try:
             dsm_hour, dsm_minute = map(int, dsm_time_str.split(':'))
         except ValueError:
@@ -815,17 +1181,11 @@ class DSM(commands.Cog):
         # Create today's DSM time
         now = datetime.datetime.now(timezone)
         dsm_start_time = now.replace(hour=dsm_hour, minute=dsm_minute, second=0, microsecond=0)
-        deadline_time = dsm_start_time + datetime.timedelta(hours=14, minutes=15)
+        deadline_time = dsm_start_time + DSM_DEADLINE_OFFSET
         
         dsm_start_str = dsm_start_time.strftime('%I:%M %p')
         deadline_str = deadline_time.strftime('%I:%M %p')
 
-        # Get all non-bot, non-excluded users
-        excluded_users = set(self.ensure_str_ids(config.get('excluded_users', [])))
-        all_mentions = []
-        for member in channel.guild.members:
-            if not member.bot and str(member.id) not in excluded_users:
-                all_mentions.append(member.mention)
 
         reminder_msg = (
             f"Good morning, team!\n\n"
@@ -834,45 +1194,98 @@ class DSM(commands.Cog):
         )
         await channel.send(reminder_msg)
 
-    @tasks.loop(minutes=1)
-    async def auto_dsm_task(self):
-        """Automatically create DSM at configured time."""
-        try:
-            for guild in self.bot.guilds:
-                config = await self.firebase_service.get_config(guild.id)
-                if not config:
-                    continue
+    async def start_auto_dsm_schedules(self):
+        """Schedule every guild's next automatic DSM once the bot is ready."""
+        await self.bot.wait_until_ready()
+        guilds = list(self.bot.guilds)
+        # Load every guild's config in one burst; later lookups are served from memory
+        configs = await self.config_cache.get_configs(guild.id for guild in guilds)
+        for guild, config in zip(guilds, configs):
+            if config:
+                await self.schedule_auto_dsm(guild, config)
+
+    async def schedule_auto_dsm(self, guild: discord.Guild, config: Mapping[str, Any],
+                                after: Optional[datetime.datetime] = None) -> None:
+        """Replace the guild's pending automatic DSM with one at its next configured DSM time.
+
+        The run is scheduled strictly after `after` when given, so a run that just
+        fired can't schedule itself again for the same time.
+        """
+        if guild.id in self._auto_dsm_firing:
+            # Cancelling now could leave a half-posted DSM; the run reschedules itself from
+            # the latest config once it is done
+            return
+        scheduled = self._auto_dsm_schedules.pop(guild.id, None)
+        if scheduled is not None and scheduled is not asyncio.current_task():
+            scheduled.cancel()
+        # Recorded before validation so an invalid time isn't retried on every config pass
+        self._auto_dsm_times[guild.id] = (config.get('timezone'), config.get('dsm_time'))
 
-                timezone = await self.get_guild_timezone(guild.id)
-                current_time = datetime.datetime.now(timezone)
-                
-                # Check if it's DSM time
-                dsm_time = datetime.datetime.strptime(config.get('dsm_time', '09:00'), '%H:%M').time()
-                if current_time.hour == dsm_time.hour and current_time.minute == dsm_time.minute:
-                    dsm_channel_ids = self.get_dsm_channel_ids(config)
-                    if not dsm_channel_ids:
-                        continue
-
-                    channel = None
-                    for channel_id in dsm_channel_ids:
-                        guild_channel = guild.get_channel(channel_id)
-                        if isinstance(guild_channel, discord.TextChannel):
-                            channel = guild_channel
-                            break
-
-                    if channel is None:
-                        continue
-
-                    # Check if DSM should be skipped for today (weekends, holidays, or manual skip)
-                    if self.should_skip_dsm_today(current_time.date(), config):
-                        continue
-
-                    if isinstance(channel, discord.TextChannel):
-                        await self.create_dsm(channel, config)
-                    logger.info(f"Created automatic DSM in {guild.name}")
+        try:
+            dsm_time = datetime.datetime.strptime(config.get('dsm_time', DEFAULT_CONFIG['dsm_time']), '%H:%M').time()
+        except ValueError:
+            logger.error(f"Invalid DSM time format for {guild.name}: {config.get('dsm_time')}")
+            return
 
+        timezone = await self.get_guild_timezone(guild.id, config)
+        now = datetime.datetime.now(timezone)
+        if after is not None:
+            # The sleep may end a hair before the wall clock reaches the run time
+            now = max(now, after.astimezone(timezone))
+        run_at = timezone.localize(datetime.datetime.combine(now.date(), dsm_time))
+        if run_at <= now:
+            run_at = timezone.localize(datetime.datetime.combine(now.date() + datetime.timedelta(days=1), dsm_time))
+
+        self._auto_dsm_schedules[guild.id] = asyncio.create_task(self._run_auto_dsm_at(guild, run_at))
+        logger.info(f"Next automatic DSM for {guild.name} at {run_at}")
+
+    async def _run_auto_dsm_at(self, guild: discord.Guild, run_at: datetime.datetime) -> None:
+        await discord.utils.sleep_until(run_at)
+        try:
+            config = await self.config_cache.get_config(guild.id)
+            # The time may have been changed outside the bot since this run was scheduled
+            if self._auto_dsm_fired.get(guild.id) == run_at:
+                logger.info(f"Automatic DSM for {guild.name} already ran at {run_at}")
+            elif config and datetime.datetime.strptime(config.get('dsm_time', DEFAULT_CONFIG['dsm_time']), '%H:%M').time() == run_at.time():
+                self._auto_dsm_fired[guild.id] = run_at
+                self._auto_dsm_firing.add(guild.id)
+                try:
+                    await self.create_automatic_dsm(guild, config, run_at.date())
+                finally:
+                    self._auto_dsm_firing.discard(guild.id)
         except Exception as e:
-            logger.error(f"Error in auto_dsm_task: {str(e)}")
+            logger.error(f"Error creating automatic DSM in {guild.name}: {str(e)}")
+
+        # Schedule the following day's run, retrying while the config can't be read
+        while self.bot.get_guild(guild.id) is not None:
+            try:
+                config = await self.config_cache.get_config_view(guild.id)
+                if config:
+                    await self.schedule_auto_dsm(guild, config, after=run_at)
+                return
+            except Exception as e:
+                logger.error(f"Error rescheduling automatic DSM for {guild.name}: {str(e)}")
+                await asyncio.sleep(60)
+
+    async def create_automatic_dsm(self, guild: discord.Guild, config: Dict[str, Any], date: datetime.date) -> None:
+        """Create the scheduled DSM unless the guild has no DSM channel or the day is skipped."""
+        dsm_channels = self.get_dsm_text_channels(guild, config)
+        if not dsm_channels:
+            return
+        channel = dsm_channels[0]
+
+        # Check if DSM should be skipped for today (weekends, holidays, or manual skip)
+        if self.should_skip_dsm_today(date, config):
+            return
+
+        await self.create_dsm(channel, config)
+        logger.info(f"Created automatic DSM in {guild.name}")
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild):
+        config = await self.config_cache.get_config_view(guild.id)
+        if config:
+            await self.schedule_auto_dsm(guild, config)
 
     @app_commands.command(name="simulate_dsm", description="Manually trigger a DSM")
     async def simulate_dsm(self, interaction: discord.Interaction):  # type: ignore
@@ -899,7 +1312,7 @@ class DSM(commands.Cog):
             if not interaction.response.is_done():
                 try:
                     logger.info("simulate_dsm stage=defer_start")
-                    await interaction.response.defer(ephemeral=True)
+                    await interaction.response.defer(ephemeral=True, thinking=True)
                 except discord.HTTPException as http_err:
                     error_code = getattr(http_err, 'code', None)
                     if error_code == 10062:
@@ -909,7 +1322,7 @@ class DSM(commands.Cog):
                         raise
             logger.info("simulate_dsm stage=defer_done elapsed=%.3fs", time.monotonic() - start_ts)
             
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             logger.info("simulate_dsm stage=config_loaded elapsed=%.3fs", time.monotonic() - start_ts)
             await self.mark_command_participation(interaction, config)
             if not config:
@@ -921,18 +1334,13 @@ class DSM(commands.Cog):
                 await _safe_reply("Please set a DSM channel first using `/set_channel`.")
                 return
 
-            channel = None
-            for channel_id in dsm_channel_ids:
-                guild_channel = interaction.guild.get_channel(channel_id)
-                if isinstance(guild_channel, discord.TextChannel):
-                    channel = guild_channel
-                    break
-            if not channel:
+            dsm_channels = self.get_dsm_text_channels(interaction.guild, config)
+            if not dsm_channels:
                 await _safe_reply("Configured DSM channels were not found. Please update channels with `/set_channel` or `/add_dsm_channel`.")
                 return
             
-            await _safe_reply("Creating DSM...")
-            await self.create_dsm(channel, config, is_automatic=False)
+            # The deferred "thinking" state covers the wait; no interim message needed
+            await self.create_dsm(dsm_channels[0], config, is_automatic=False)
             
             # Send success message
             await _safe_reply("DSM created successfully!")
@@ -948,12 +1356,16 @@ class DSM(commands.Cog):
             except (discord.NotFound, discord.HTTPException):
                 logger.error("Unable to send simulate_dsm error response before interaction expiry.")
 
-    async def get_guild_timezone(self, guild_id: int) -> pytz.BaseTzInfo:
-        """Get the timezone for a guild, defaulting to UTC if not set."""
+    async def get_guild_timezone(self, guild_id: int, config: Optional[Dict[str, Any]] = None) -> pytz.BaseTzInfo:
+        """Get the timezone for a guild, defaulting to UTC if not set.
+
+        Pass an already-fetched config to skip the Firebase read.
+        """
         try:
-            config = await self.firebase_service.get_config(guild_id)
-            timezone_str = config.get('timezone', 'UTC')
-            return pytz.timezone(timezone_str)
+            if config is None:
+                config = await self.config_cache.get_config_view(guild_id)
+            timezone_str = config.get('timezone', DEFAULT_CONFIG['timezone'])
+            return get_timezone(timezone_str)
         except Exception as e:
             logger.error(f"Error getting timezone for guild {guild_id}: {str(e)}")
             return pytz.UTC
@@ -998,7 +1410,7 @@ class DSM(commands.Cog):
             # Get current config with a bounded wait so command responses don't expire.
             try:
                 config = await asyncio.wait_for(
-                    self.firebase_service.get_config(interaction.guild_id),
+                    self.config_cache.get_config(interaction.guild_id),
                     timeout=12.0
                 )
             except asyncio.TimeoutError:
@@ -1010,6 +1422,7 @@ class DSM(commands.Cog):
                 config = {}
 
             changes = []
+            updates = {}
 
             # Handle timezone
             if timezone:
@@ -1020,8 +1433,8 @@ class DSM(commands.Cog):
                         normalized_timezone = '/'.join(
                             part.capitalize() if part else part for part in parts
                         )
-                    pytz.timezone(normalized_timezone)
-                    config['timezone'] = normalized_timezone
+                    get_timezone(normalized_timezone)
+                    updates['timezone'] = normalized_timezone
                     changes.append(f"Timezone: {normalized_timezone}")
                 except pytz.exceptions.UnknownTimeZoneError:
                     await _safe_reply(content=f"Invalid timezone: {timezone}. Please use a valid timezone name (e.g., 'Asia/Manila', 'UTC').")
@@ -1037,7 +1450,7 @@ class DSM(commands.Cog):
                     hour, minute = map(int, normalized_time.split(':'))
                     if not (0 <= hour <= 23 and 0 <= minute <= 59):
                         raise ValueError
-                    config['dsm_time'] = f"{hour:02d}:{minute:02d}"
+                    updates['dsm_time'] = f"{hour:02d}:{minute:02d}"
                     changes.append(f"DSM Time: {hour:02d}:{minute:02d}")
                 except ValueError:
                     await _safe_reply(content="Invalid time format. Please use HH:MM format (e.g., '09:00').")
@@ -1045,8 +1458,8 @@ class DSM(commands.Cog):
 
             # Handle DSM channel
             if dsm_channel is not None:
-                config['dsm_channel_id'] = str(dsm_channel.id)
-                config['dsm_channel_ids'] = [str(dsm_channel.id)]
+                updates['dsm_channel_id'] = str(dsm_channel.id)
+                updates['dsm_channel_ids'] = [str(dsm_channel.id)]
                 changes.append(f"DSM Channel: {dsm_channel.mention}")
 
             # Handle DSM lookback hours
@@ -1054,11 +1467,16 @@ class DSM(commands.Cog):
                 if not (0 <= dsm_lookback_hours <= 24):
                     await _safe_reply(content="Invalid lookback hours. Please use a value between 0 and 24 hours.")
                     return
-                config['dsm_lookback_hours'] = dsm_lookback_hours
+                updates['dsm_lookback_hours'] = dsm_lookback_hours
                 changes.append(f"DSM Lookback Hours: {dsm_lookback_hours}")
 
-            # Update config
-            await self.firebase_service.update_config(interaction.guild_id, config)
+            # Write only the settings given, so defaults filled in by the cache stay out of Firestore
+            if updates:
+                await self.config_cache.update_config(interaction.guild_id, updates)
+                config.update(updates)
+            self._dsm_channel_ids.pop(interaction.guild_id, None)
+            if interaction.guild is not None and (timezone or dsm_time):
+                await self.schedule_auto_dsm(interaction.guild, config)
 
             # Create confirmation embed
             embed = discord.Embed(
@@ -1094,15 +1512,9 @@ class DSM(commands.Cog):
                         current_config.append(f"DSM Channel: {channel.mention}")
                 except (ValueError, TypeError):
                     current_config.append(f"DSM Channel: Invalid ID format")
-            dsm_channel_ids = self.get_dsm_channel_ids(config)
-            if dsm_channel_ids:
-                channel_mentions = []
-                for channel_id in dsm_channel_ids:
-                    resolved_channel = interaction.guild.get_channel(channel_id)
-                    if isinstance(resolved_channel, discord.TextChannel):
-                        channel_mentions.append(resolved_channel.mention)
-                if channel_mentions:
-                    current_config.append(f"DSM Channels: {', '.join(channel_mentions)}")
+            channel_mentions = [channel.mention for channel in self.get_dsm_text_channels(interaction.guild, config)]
+            if channel_mentions:
+                current_config.append(f"DSM Channels: {', '.join(channel_mentions)}")
             if config.get('dsm_status_channel_id'):
                 try:
                     status_id = int(config['dsm_status_channel_id'])
@@ -1159,11 +1571,12 @@ class DSM(commands.Cog):
         """Set the channel where DSMs will be posted."""
         try:
             # Backward compatible set: this resets DSM channels to just the selected channel.
-            await self.firebase_service.update_config(interaction.guild_id, {
+            await self.config_cache.update_config(interaction.guild_id, {
                 'dsm_channel_id': str(channel.id),
                 'dsm_channel_ids': [str(channel.id)]
             })
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            self._dsm_channel_ids.pop(interaction.guild_id, None)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             
             # Create confirmation embed
@@ -1187,7 +1600,7 @@ class DSM(commands.Cog):
     async def add_dsm_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
         """Add a DSM prompt channel without removing existing ones."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config_view(interaction.guild_id)
             dsm_channel_ids = {str(channel_id) for channel_id in self.get_dsm_channel_ids(config)}
             dsm_channel_ids.add(str(channel.id))
 
@@ -1195,7 +1608,8 @@ class DSM(commands.Cog):
             if not config.get('dsm_channel_id'):
                 updates['dsm_channel_id'] = str(channel.id)
 
-            await self.firebase_service.update_config(interaction.guild_id, updates)
+            await self.config_cache.update_config(interaction.guild_id, updates)
+            self._dsm_channel_ids.pop(interaction.guild_id, None)
             await interaction.response.send_message(f"Added {channel.mention} to DSM prompt channels.", ephemeral=True)
         except Exception as e:
             logger.error(f"Error adding DSM channel: {str(e)}")
@@ -1205,14 +1619,15 @@ class DSM(commands.Cog):
     async def remove_dsm_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
         """Remove a DSM prompt channel."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config_view(interaction.guild_id)
             dsm_channel_ids = [str(channel_id) for channel_id in self.get_dsm_channel_ids(config) if int(channel_id) != channel.id]
 
             updates: Dict[str, Any] = {'dsm_channel_ids': dsm_channel_ids}
             if str(config.get('dsm_channel_id')) == str(channel.id):
                 updates['dsm_channel_id'] = dsm_channel_ids[0] if dsm_channel_ids else None
 
-            await self.firebase_service.update_config(interaction.guild_id, updates)
+            await self.config_cache.update_config(interaction.guild_id, updates)
+            self._dsm_channel_ids.pop(interaction.guild_id, None)
             await interaction.response.send_message(f"Removed {channel.mention} from DSM prompt channels.", ephemeral=True)
         except Exception as e:
             logger.error(f"Error removing DSM channel: {str(e)}")
@@ -1222,7 +1637,7 @@ class DSM(commands.Cog):
     async def set_dsm_status_channel(self, interaction: discord.Interaction, channel: discord.TextChannel):
         """Set dedicated status channel for DSM participant tracking updates."""
         try:
-            await self.firebase_service.update_config(interaction.guild_id, {'dsm_status_channel_id': str(channel.id)})
+            await self.config_cache.update_config(interaction.guild_id, {'dsm_status_channel_id': str(channel.id)})
             await interaction.response.send_message(
                 f"DSM status updates will be posted in {channel.mention}.",
                 ephemeral=True
@@ -1235,12 +1650,8 @@ class DSM(commands.Cog):
     async def list_dsm_channels(self, interaction: discord.Interaction):
         """List configured DSM prompt channels and the dedicated status channel."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
-            dsm_channels: List[str] = []
-            for channel_id in self.get_dsm_channel_ids(config):
-                channel = interaction.guild.get_channel(channel_id)
-                if isinstance(channel, discord.TextChannel):
-                    dsm_channels.append(channel.mention)
+            config = await self.config_cache.get_config_view(interaction.guild_id)
+            dsm_channels = [channel.mention for channel in self.get_dsm_text_channels(interaction.guild, config)]
 
             status_channel_value = "Not set"
             status_channel_id = config.get('dsm_status_channel_id')
@@ -1268,30 +1679,36 @@ class DSM(commands.Cog):
     async def skip_dsm(self, interaction: discord.Interaction, date: str):
         """Skip DSM on a specific date."""
         try:
-            # Validate date format
-            datetime.datetime.strptime(date, '%Y-%m-%d')
-            
+            # Normalize too: Python 3.11+ also accepts forms like 20240321
+            date = datetime.date.fromisoformat(date).isoformat()
+        except ValueError:
+            await interaction.response.send_message(
+                "Invalid date format. Please use YYYY-MM-DD (e.g., 2024-03-21)",
+                ephemeral=True
+            )
+            return
+
+        try:
             # Defer the response to prevent timeout
             await interaction.response.defer(ephemeral=True)
             
             # Get current config
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             
+            def skip(config: Mapping[str, Any]) -> Dict[str, Any]:
+                skipped_dates = self.skipped_dates_map(config)
+                if date in skipped_dates:
+                    return {}
+                return {'skipped_dates': {**skipped_dates, date: True}}
+
             # Add date to skipped dates if not already present
-            if date not in config.get('skipped_dates', []):
-                skipped_dates = config.get('skipped_dates', []) + [date]
-                await self.firebase_service.update_config(interaction.guild_id, {'skipped_dates': skipped_dates})
+            if await self.optimistic_update(interaction, skip):
                 await interaction.followup.send(f"DSM will be skipped on {date}", ephemeral=True)
                 logger.info(f"Added {date} to skipped dates")
             else:
                 await interaction.followup.send(f"DSM is already scheduled to be skipped on {date}", ephemeral=True)
-                
-        except ValueError:
-            await interaction.followup.send(
-                "Invalid date format. Please use YYYY-MM-DD (e.g., 2024-03-21)",
-                ephemeral=True
-            )
+
         except Exception as e:
             logger.error(f"Error in skip_dsm: {str(e)}")
             await interaction.followup.send(
@@ -1303,31 +1720,36 @@ class DSM(commands.Cog):
     async def unskip_dsm(self, interaction: discord.Interaction, date: str):
         """Remove a date from the skipped DSM list."""
         try:
-            # Validate date format
-            datetime.datetime.strptime(date, '%Y-%m-%d')
-            
+            # Normalize too: Python 3.11+ also accepts forms like 20240321
+            date = datetime.date.fromisoformat(date).isoformat()
+        except ValueError:
+            await interaction.response.send_message(
+                "Invalid date format. Please use YYYY-MM-DD (e.g., 2024-03-21)",
+                ephemeral=True
+            )
+            return
+
+        try:
             # Defer the response to prevent timeout
             await interaction.response.defer(ephemeral=True)
             
             # Get current config
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             
+            def unskip(config: Mapping[str, Any]) -> Dict[str, Any]:
+                skipped_dates = self.skipped_dates_map(config)
+                if date not in skipped_dates:
+                    return {}
+                return {'skipped_dates': {skipped: True for skipped in skipped_dates if skipped != date}}
+
             # Remove date from skipped dates if present
-            skipped_dates = config.get('skipped_dates', [])
-            if date in skipped_dates:
-                skipped_dates.remove(date)
-                await self.firebase_service.update_config(interaction.guild_id, {'skipped_dates': skipped_dates})
+            if await self.optimistic_update(interaction, unskip):
                 await interaction.followup.send(f"DSM will no longer be skipped on {date}", ephemeral=True)
                 logger.info(f"Removed {date} from skipped dates")
             else:
                 await interaction.followup.send(f"DSM was not scheduled to be skipped on {date}", ephemeral=True)
-                
-        except ValueError:
-            await interaction.followup.send(
-                "Invalid date format. Please use YYYY-MM-DD (e.g., 2024-03-21)",
-                ephemeral=True
-            )
+
         except Exception as e:
             logger.error(f"Error in unskip_dsm: {str(e)}")
             await interaction.followup.send(
@@ -1343,30 +1765,32 @@ class DSM(commands.Cog):
             await interaction.response.defer(ephemeral=True)
             
             # Get current config
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
-            skipped_dates = config.get('skipped_dates', [])
+            # ISO dates sort chronologically as strings
+            skipped_dates = sorted(self.skipped_dates_map(config))
             
             if skipped_dates:
-                # Sort dates
-                skipped_dates.sort()
-                
-                # Create embed
-                embed = discord.Embed(
-                    title="Skipped DSM Dates",
-                    description="The following dates are scheduled to skip DSM:",
-                    color=discord.Color.blue()
-                )
-                
-                # Add dates to embed
+                # Dates go in the description rather than one field each, which would stop at
+                # Discord's 25-field limit; a very long list continues in further embeds.
+                pages = []
+                lines = ["The following dates are scheduled to skip DSM:"]
+                length = len(lines[0])
                 for date in skipped_dates:
-                    embed.add_field(
-                        name=date,
-                        value="DSM will be skipped",
-                        inline=False
+                    if length + len(date) + 1 > EMBED_DESCRIPTION_LIMIT:
+                        pages.append("\n".join(lines))
+                        lines, length = [], -1
+                    lines.append(date)
+                    length += len(date) + 1
+                pages.append("\n".join(lines))
+
+                for page in pages:
+                    embed = discord.Embed(
+                        title="Skipped DSM Dates",
+                        description=page,
+                        color=discord.Color.blue()
                     )
-                
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                    await interaction.followup.send(embed=embed, ephemeral=True)
             else:
                 await interaction.followup.send("No dates are currently scheduled to skip DSM.", ephemeral=True)
                 
@@ -1380,57 +1804,78 @@ class DSM(commands.Cog):
     async def is_admin(self, user_id: int, guild_id: int) -> bool:
         """Check if a user is an admin in the guild."""
         try:
-            config = await self.firebase_service.get_config(guild_id)
-            admin_users = config.get('admin_users', [])
-            return user_id in admin_users
+            admin_users = await self.config_cache.get_id_set(guild_id, 'admin_users')
+            return str(user_id) in admin_users
         except Exception as e:
             logger.error(f"Error checking admin status: {str(e)}")
             return False
 
-    def ensure_int_ids(self, id_list: List) -> List[int]:
-        """Convert all IDs in a list to integers."""
-        return [int(id) for id in id_list]
-
-    def ensure_str_ids(self, id_list: List) -> List[str]:
-        """Convert all IDs in a list to strings."""
-        return [str(id) for id in id_list]
-
-    async def get_excluded_users(self, guild_id: int) -> List[int]:
-        """Get list of excluded user IDs, ensuring they are integers."""
-        config = await self.firebase_service.get_config(guild_id)
-        excluded_users = config.get('excluded_users', [])
-        return self.ensure_int_ids(excluded_users)
+    def ensure_int_ids(self, id_list: Iterable) -> Iterator[int]:
+        """Lazily convert IDs to integers; wrap in list() or frozenset() to keep them."""
+        return map(int, id_list)
+
+    def ensure_str_ids(self, id_list: Iterable) -> Iterator[str]:
+        """Lazily convert IDs to strings; wrap in list() or frozenset() to keep them."""
+        return map(str, id_list)
+
+    async def get_excluded_users(self, guild_id: int) -> FrozenSet[int]:
+        """Get excluded user IDs as integers, reusing the last set while exclusions are unchanged."""
+        excluded_key = await self.config_cache.get_id_set(guild_id, 'excluded_users')
+        cached = self._excluded_int_ids.get(guild_id)
+        if cached is not None and cached[0] == excluded_key:
+            return cached[1]
+        excluded_ids = frozenset(self.ensure_int_ids(excluded_key))
+        self._excluded_int_ids[guild_id] = (excluded_key, excluded_ids)
+        return excluded_ids
+
+    def excluded_users_map(self, config: Dict[str, Any]) -> Dict[str, bool]:
+        """Return excluded users as a {user_id: True} map, upgrading the legacy list shape."""
+        excluded_users = config.get('excluded_users') or {}
+        if isinstance(excluded_users, dict):
+            return excluded_users
+        return {str(user_id): True for user_id in excluded_users}
+
+    def skipped_dates_map(self, config: Mapping[str, Any]) -> Dict[str, bool]:
+        """Return skipped dates as a {YYYY-MM-DD: True} map, upgrading the legacy list shape."""
+        skipped_dates = config.get('skipped_dates') or {}
+        if isinstance(skipped_dates, dict):
+            return skipped_dates
+        return dict.fromkeys(map(str, skipped_dates), True)
 
     @app_commands.command(name="exclude_user", description="Exclude a user from DSM")
     async def exclude_user(self, interaction: discord.Interaction, user: discord.Member):
         """Exclude a user from DSM."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
-            await self.mark_command_participation(interaction, config)
-            logger.info(f"[DEBUG] Current config for guild {interaction.guild_id}: {config}")
-            
-            if not config:
-                config = {}
+            # Defer first so a slow Firestore read can't exceed Discord's 3-second ACK window
+            await interaction.response.defer(ephemeral=True)
+            user_id = str(user.id)
 
-            excluded_users = set(self.ensure_str_ids(config.get('excluded_users', [])))
-            logger.info(f"[DEBUG] Current excluded users: {excluded_users}")
-            
-            excluded_users.add(str(user.id))
-            logger.info(f"[DEBUG] Adding user {user.id} to excluded users. New set: {excluded_users}")
-            
-            config['excluded_users'] = list(excluded_users)
-            await self.firebase_service.update_config(interaction.guild_id, config)
-            logger.info(f"[DEBUG] Updated config with excluded users: {config}")
-            
-            await interaction.response.send_message(
-                f"{user.mention} has been excluded from DSM.",
-                ephemeral=True
-            )
-            logger.info(f"Excluded user {user.name} ({user.id}) from DSM")
+            def exclude(config: Mapping[str, Any]) -> Dict[str, Any]:
+                excluded_users = self.excluded_users_map(config)
+                if user_id in excluded_users:
+                    return {}
+                return {'excluded_users': {**excluded_users, user_id: True}}
+
+            # The cache is updated immediately and Firestore is written in the background
+            if await self.optimistic_update(interaction, exclude):
+                await interaction.followup.send(
+                    f"{user.mention} has been excluded from DSM.",
+                    ephemeral=True
+                )
+                logger.info(f"Excluded user {user.name} ({user.id}) from DSM")
+            else:
+                await interaction.followup.send(
+                    f"{user.mention} is already excluded from DSM.",
+                    ephemeral=True
+                )
+
+            # Participation tracking writes the config, so it runs after the user has their answer.
+            config = await self.config_cache.get_config(interaction.guild_id) or {}
+            await self.mark_command_participation(interaction, config)
             
         except Exception as e:
             logger.error(f"Error excluding user: {str(e)}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "Failed to exclude user. Please try again.",
                 ephemeral=True
             )
@@ -1439,31 +1884,36 @@ class DSM(commands.Cog):
     async def include_user(self, interaction: discord.Interaction, user: discord.Member):
         """Include a user in DSM."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
-            await self.mark_command_participation(interaction, config)
-            if not config:
-                config = {}
+            # Defer first so a slow Firestore read can't exceed Discord's 3-second ACK window
+            await interaction.response.defer(ephemeral=True)
+            user_id = str(user.id)
 
-            excluded_users = set(self.ensure_str_ids(config.get('excluded_users', [])))
-            if str(user.id) in excluded_users:
-                excluded_users.remove(str(user.id))
-                config['excluded_users'] = list(excluded_users)
-                await self.firebase_service.update_config(interaction.guild_id, config)
-                
-                await interaction.response.send_message(
+            def include(config: Mapping[str, Any]) -> Dict[str, Any]:
+                excluded_users = self.excluded_users_map(config)
+                if user_id not in excluded_users:
+                    return {}
+                return {'excluded_users': {uid: True for uid in excluded_users if uid != user_id}}
+
+            # The common no-op case is answered from the cached config without any write.
+            if await self.optimistic_update(interaction, include):
+                await interaction.followup.send(
                     f"{user.mention} has been included in DSM.",
                     ephemeral=True
                 )
                 logger.info(f"Included user {user.name} ({user.id}) in DSM")
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     f"{user.mention} is already included in DSM.",
                     ephemeral=True
                 )
+
+            # Participation tracking writes the config, so it runs after the user has their answer.
+            config = await self.config_cache.get_config(interaction.guild_id) or {}
+            await self.mark_command_participation(interaction, config)
             
         except Exception as e:
             logger.error(f"Error including user: {str(e)}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "Failed to include user. Please try again.",
                 ephemeral=True
             )
@@ -1472,27 +1922,31 @@ class DSM(commands.Cog):
     async def list_excluded(self, interaction: discord.Interaction):
         """List all excluded users."""
         try:
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            # Defer first so a slow Firestore read can't exceed Discord's 3-second ACK window
+            await interaction.response.defer(ephemeral=True)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
-            logger.info(f"[DEBUG] Config for list_excluded: {config}")
+            logger.debug("Config for list_excluded: %s", config)
             
-            excluded_users = config.get('excluded_users', [])
-            logger.info(f"[DEBUG] Raw excluded users from config: {excluded_users}")
+            excluded_users = self.excluded_users_map(config)
+            logger.debug("Raw excluded users from config: %s", excluded_users)
             
             if excluded_users:
-                excluded_members = []
-                for user_id in excluded_users:
-                    logger.info(f"[DEBUG] Processing user_id: {user_id} (type: {type(user_id)})")
+                # Validate IDs once up front, then resolve them against the guild member cache in one pass
+                user_ids = list(map(int, filter(str.isdigit, map(str, excluded_users))))
+                get_member = interaction.guild.get_member
+                resolved = {member.id: member for member in map(get_member, user_ids) if member}
+
+                # Anything the cache missed is fetched with one gateway request (max 100 IDs)
+                missing_ids = [user_id for user_id in user_ids if user_id not in resolved][:100]
+                if missing_ids:
                     try:
-                        member = interaction.guild.get_member(int(user_id))
-                        if member:
-                            excluded_members.append(member.mention)
-                            logger.info(f"[DEBUG] Found member: {member.name} ({member.id})")
-                        else:
-                            logger.info(f"[DEBUG] No member found for ID: {user_id}")
-                    except ValueError as e:
-                        logger.error(f"[DEBUG] Error converting user_id to int: {e}")
-                        continue
+                        fetched = await interaction.guild.query_members(user_ids=missing_ids, limit=len(missing_ids))
+                        resolved.update((member.id, member) for member in fetched)
+                    except (asyncio.TimeoutError, discord.ClientException) as e:
+                        logger.warning(f"Could not query uncached excluded members: {e}")
+
+                excluded_members = [resolved[user_id] for user_id in user_ids if user_id in resolved]
                 
                 embed = discord.Embed(
                     title="Excluded Users",
@@ -1501,20 +1955,20 @@ class DSM(commands.Cog):
                 )
                 embed.add_field(
                     name="Users",
-                    value="\n".join(excluded_members) if excluded_members else "None",
+                    value=self.format_mention_list(excluded_members),
                     inline=False
                 )
                 
-                await interaction.response.send_message(embed=embed, ephemeral=True)
+                await interaction.followup.send(embed=embed, ephemeral=True)
             else:
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "No users are currently excluded from DSM.",
                     ephemeral=True
                 )
             
         except Exception as e:
             logger.error(f"Error listing excluded users: {str(e)}")
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "Failed to list excluded users. Please try again.",
                 ephemeral=True
             )
@@ -1525,7 +1979,7 @@ class DSM(commands.Cog):
         try:
             # Defer the response to prevent timeout
             await interaction.response.defer(ephemeral=True)
-            config = await self.firebase_service.get_config(interaction.guild_id)
+            config = await self.config_cache.get_config(interaction.guild_id)
             await self.mark_command_participation(interaction, config)
             
             # Test the extract_tasks_from_message function
@@ -1569,10 +2023,9 @@ class DSM(commands.Cog):
             # Last DSM time and lookback
             last_dsm_time = config.get('last_dsm_time')
             if last_dsm_time:
-                last_dsm_time = datetime.datetime.fromisoformat(last_dsm_time)
-                lookback_hours = config.get('dsm_lookback_hours', 2)
-                lookback_time = last_dsm_time - datetime.timedelta(hours=lookback_hours)
-                dsm_deadline = last_dsm_time + datetime.timedelta(hours=14, minutes=15)
+                last_dsm_time = parse_iso_datetime(last_dsm_time)
+                lookback_hours = config.get('dsm_lookback_hours', DEFAULT_CONFIG['dsm_lookback_hours'])
+                lookback_time, dsm_deadline = get_dsm_window(last_dsm_time, lookback_hours)
                 embed.add_field(
                     name="Time Windows",
                     value=f"Last DSM: {last_dsm_time}\nLookback: {lookback_hours} hours\nLookback Period: {lookback_time} to {last_dsm_time}\nDSM Period: {last_dsm_time} to {dsm_deadline}",
@@ -1594,28 +2047,21 @@ class DSM(commands.Cog):
             )
             
             # Excluded users
-            excluded_users = config.get('excluded_users', [])
-            excluded_mentions = []
-            for user_id in excluded_users:
-                member = interaction.guild.get_member(int(user_id))
-                excluded_mentions.append(member.mention if member else f"<@{user_id}>")
+            excluded_users = self.excluded_users_map(config)
+            # A raw <@id> renders the same as Member.mention, so no member lookup is needed
+            excluded_mentions = [f"<@{user_id}>" for user_id in filter(str.isdigit, map(str, excluded_users))]
             embed.add_field(
                 name="Excluded Users",
-                value="\n".join(excluded_mentions) if excluded_mentions else "None",
+                value="\n".join(excluded_mentions) or "None",
                 inline=False
             )
             
             # Test message processing
-            test_content = """TODO
-Task 1: Test task
-Task 2: Another test task
-
-Regular message content"""
-            
+            test_content = DEBUG_TODO_TEST_CONTENT
             tasks = self.extract_tasks_from_message(test_content)
             embed.add_field(
                 name="Test Message Processing",
-                value=f"Test content:\n```\n{test_content}\n```\nExtracted tasks:\n" + "\n".join([f"• {task}" for task in tasks]),
+                value=f"Test content:\n```\n{test_content}\n```\nExtracted tasks:\n" + "\n".join(f"• {task}" for task in tasks),
                 inline=False
             )
             
@@ -1623,7 +2069,7 @@ Regular message content"""
             
         except Exception as e:
             logger.error(f"Error in debug_todo: {e}")
-            await interaction.response.send_message(f"Error during debug: {e}", ephemeral=True)
+            await interaction.followup.send(f"Error during debug: {e}", ephemeral=True)
 
     @app_commands.command(name="debug_firebase", description="Show Firebase env diagnostics (safe summary)")
     @admin_required()
@@ -1703,8 +2149,7 @@ Regular message content"""
 # Move setup function outside of the class, at module level
 async def setup(bot: commands.Bot):
     """Setup function for the DSM cog."""
-    from services.firebase_service import FirebaseService
-    
-    # Firebase service now uses environment variables exclusively
-    firebase_service = FirebaseService()
+    # Firebase service now uses environment variables exclusively. The first call sets up the
+    # synchronous Firebase Admin client, so it runs in a thread to keep the gateway heartbeat going.
+    firebase_service = await asyncio.to_thread(get_firebase_service)
     await bot.add_cog(DSM(bot, firebase_service))
\ No newline at end of file
@@ -1,9 +1,12 @@
+import asyncio
 import os
+import time
+from collections import OrderedDict, deque
 import discord
 from discord.ext import commands
 from discord import app_commands
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from services.ai_service import AIService
 from utils.logging_util import get_logger
@@ -12,12 +15,46 @@ load_dotenv()
 
 logger = get_logger("translator_cog")
 
+# Minimum seconds between edits while an AI response streams in
+STREAM_EDIT_INTERVAL = 0.75
+# Discord rejects message content longer than this
+MESSAGE_CONTENT_LIMIT = 2000
+
+# Seconds a collected message window is reused for another command on the same channel
+COLLECTED_MESSAGES_TTL = 30.0
+# Messages scanned to find n that aren't the bot's own; one history page, and n is at most 50
+COLLECT_SCAN_LIMIT = 100
+# Channels whose newest message is tracked for the collected-message cache, least recently collected dropped first
+TRACKED_CHANNELS_LIMIT = 256
+
+# Prompt templates, filled in with the collected messages through str.format(messages=...)
+TRANSLATE_PROMPT = (
+    "You are an expert translator specializing in Filipino internet and workplace communication. "
+    "Translate the following Discord chat messages from Filipino, Taglish, or any informal Filipino dialect "
+    "(including slang, 'jejemon', text-speak, and corporate acronyms) into clear, professional English. "
+    "The messages are in chronological order. Preserve the original meaning, nuance, and intent. Please use as little lines as possible. Don't add an introduction or a conclusion. Assume that the reader is already familiar with the context. Assume that blank lines are images. Do not try to parse the image, simply ignore it and state that it is an image. \n"
+    "---BEGIN MESSAGES---\n{messages}\n---END MESSAGES---"
+)
+
+SIMPLIFY_PROMPT = (
+    "You are an expert communicator who excels at explaining complex technical topics to a non-technical audience. "
+    "Simplify the following Discord chat messages. Your task is to rephrase the conversation, "
+    "explaining any jargon, acronyms, or complex technical concepts in very simple, easy-to-understand terms. "
+    "The goal is to make the entire conversation accessible to someone with absolutely no technical background. "
+    "Focus on clarity and simplicity over technical accuracy if a trade-off is needed. Please use as little lines as possible. Don't add an introduction or a conclusion. Assume that the reader is already familiar with the context. Assume that blank lines are images. Do not try to parse the image, simply ignore it and state that it is an image."
+    "---BEGIN MESSAGES---\n{messages}\n---END MESSAGES---"
+)
+
 class Translator(commands.Cog):
     """A cog for translation and simplification functionalities."""
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.ai_service = AIService()
+        # (channel_id, newest message id not sent by the bot, n) -> (monotonic time, formatted messages)
+        self._collected: Dict[Tuple[int, int, int], Tuple[float, str]] = {}
+        # Newest message not sent by the bot, tracked by on_message for channels _collect has read
+        self._latest_message_ids: "OrderedDict[int, int]" = OrderedDict()
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             logger.error("GEMINI_API_KEY not found in .env file.")
@@ -25,51 +62,79 @@ class Translator(commands.Cog):
             self.ai_service.set_api_key(api_key)
             logger.info("Translator Cog AI Service initialized.")
 
-    @app_commands.command(name="translate", description="Translates the last n messages in the channel to English.")
-    @app_commands.describe(n="The number of recent messages to translate (1-50, default: 15).")
-    async def translate(self, interaction: discord.Interaction, n: Optional[int]):
-        """Translates the last n messages to English, understanding informal language."""
-        if n is None:
-            n = 15
-        
-        if not 1 <= n <= 50:
-            await interaction.response.send_message("Please provide a number between 1 and 50.", ephemeral=True)
-            return
+    async def cog_unload(self):
+        await self.ai_service.close()
 
-        if not self.ai_service.api_key:
-            await interaction.response.send_message("Sorry, the translation service is not configured correctly. The API key is missing.", ephemeral=True)
-            return
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.channel.id in self._latest_message_ids and message.author != self.bot.user:
+            self._latest_message_ids[message.channel.id] = message.id
 
-        await interaction.response.defer()
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        # Raw events fire for messages outside discord.py's cache too. The bot's own
+        # edits (streamed replies) never appear in a collected window, so they are skipped.
+        if payload.data.get('author', {}).get('id') != str(self.bot.user.id):
+            self._forget_channel(payload.channel_id)
 
-        messages = [msg async for msg in interaction.channel.history(limit=n)]
-        messages.reverse()
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        self._forget_channel(payload.channel_id)
 
-        if not messages:
-            await interaction.followup.send("There are no messages to translate in this channel.", ephemeral=True)
-            return
-            
-        formatted_messages = "\n".join([f"{msg.author.display_name}: {msg.content}" for msg in messages])
-
-        prompt = (
-            "You are an expert translator specializing in Filipino internet and workplace communication. "
-            "Translate the following Discord chat messages from Filipino, Taglish, or any informal Filipino dialect "
-            "(including slang, 'jejemon', text-speak, and corporate acronyms) into clear, professional English. "
-            "The messages are in chronological order. Preserve the original meaning, nuance, and intent. Please use as little lines as possible. Don't add an introduction or a conclusion. Assume that the reader is already familiar with the context. Assume that blank lines are images. Do not try to parse the image, simply ignore it and state that it is an image. \n"
-            f"---BEGIN MESSAGES---\n{formatted_messages}\n---END MESSAGES---"
-        )
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent):
+        self._forget_channel(payload.channel_id)
 
-        try:
-            translation = await self.ai_service.generate_response(prompt)
-            await interaction.followup.send(f"**English Translation:**\n{translation}")
-        except Exception as e:
-            logger.error(f"Error during translation for last {n} messages: {e}")
-            await interaction.followup.send("Sorry, an error occurred while trying to translate. The AI service may be unavailable.", ephemeral=True)
-
-    @app_commands.command(name="noalien", description="Simplifies the last n messages for non-technical people.")
-    @app_commands.describe(n="The number of recent messages to simplify (1-50, default: 15).")
-    async def noalien(self, interaction: discord.Interaction, n: Optional[int]):
-        """Simplifies technical jargon from the last n messages."""
+    def _forget_channel(self, channel_id: int) -> None:
+        """Drop a channel's collected windows after an edit or delete, so the next command refetches."""
+        if self._latest_message_ids.pop(channel_id, None) is None:
+            return
+        for key in [k for k in self._collected if k[0] == channel_id]:
+            del self._collected[key]
+
+    async def _collect(self, channel: discord.abc.Messageable, n: int) -> str:
+        """Return the last n messages of a channel as "author: content" lines, oldest first.
+
+        The bot's own messages (earlier replies, the "thinking" placeholder) are
+        left out. Results are cached briefly per channel and newest message from
+        anyone else, so running /laymanize right after /noalien doesn't fetch the
+        same history again.
+        """
+        now = time.monotonic()
+        latest_id = self._latest_message_ids.get(channel.id)
+        if latest_id is not None:
+            cached = self._collected.get((channel.id, latest_id, n))
+            if cached is not None and now - cached[0] < COLLECTED_MESSAGES_TTL:
+                return cached[1]
+
+        # History arrives newest first; prepending yields chronological order without a reverse pass
+        lines = deque()
+        newest_id = None
+        async for msg in channel.history(limit=COLLECT_SCAN_LIMIT):
+            if msg.author == self.bot.user:
+                continue
+            if newest_id is None:
+                newest_id = msg.id
+            lines.appendleft(f"{msg.author.display_name}: {msg.content}")
+            if len(lines) == n:
+                break
+        formatted_messages = "\n".join(lines)
+
+        # Drop expired entries so the cache only holds recent requests
+        for stale_key in [k for k, (fetched_at, _) in self._collected.items() if now - fetched_at >= COLLECTED_MESSAGES_TTL]:
+            del self._collected[stale_key]
+        if newest_id is not None:
+            # Snowflakes grow over time; keep whichever is newer if on_message got there first
+            self._latest_message_ids[channel.id] = max(newest_id, self._latest_message_ids.get(channel.id, 0))
+            self._latest_message_ids.move_to_end(channel.id)
+            while len(self._latest_message_ids) > TRACKED_CHANNELS_LIMIT:
+                self._latest_message_ids.popitem(last=False)
+            self._collected[(channel.id, newest_id, n)] = (now, formatted_messages)
+        return formatted_messages
+
+    async def _rewrite_messages(self, interaction: discord.Interaction, n: Optional[int], *, verb: str, noun: str,
+                                prompt_template: str, heading: str, error_message: str):
+        """Validate n, collect the last n messages and post the AI's rewrite of them."""
         if n is None:
             n = 15
 
@@ -78,42 +143,82 @@ class Translator(commands.Cog):
             return
 
         if not self.ai_service.api_key:
-            await interaction.response.send_message("Sorry, the simplification service is not configured correctly. The API key is missing.", ephemeral=True)
+            await interaction.response.send_message(f"Sorry, the {noun} service is not configured correctly. The API key is missing.", ephemeral=True)
             return
 
+        # The defer ACK and the history fetch are independent round trips, so the fetch starts
+        # first and runs while the ACK is sent; its errors surface inside the try below
+        collect_task = asyncio.create_task(self._collect(interaction.channel, n))
         await interaction.response.defer()
 
-        messages = [msg async for msg in interaction.channel.history(limit=n)]
-        messages.reverse()
+        try:
+            formatted_messages = await collect_task
+
+            if not formatted_messages:
+                await interaction.followup.send(f"There are no messages to {verb} in this channel.", ephemeral=True)
+                return
+
+            prompt = prompt_template.format(messages=formatted_messages)
+
+            # Post right away and fill the message in as the response streams, instead of
+            # leaving the user with nothing to read until the whole response is done
+            header = f"**{heading}:**\n"
+            message = await interaction.followup.send(f"{header}…", wait=True)
+            response = ""
+            last_edit = time.monotonic()
+            stream = self.ai_service.stream_response(prompt)
+            try:
+                async for chunk in stream:
+                    response += chunk
+                    if time.monotonic() - last_edit >= STREAM_EDIT_INTERVAL:
+                        await message.edit(content=(header + response)[:MESSAGE_CONTENT_LIMIT])
+                        last_edit = time.monotonic()
+            finally:
+                # Release the request slot and HTTP connection at once if an edit fails mid-stream
+                await stream.aclose()
+            # The full response can exceed Discord's message limit; the rest goes in further messages
+            content = header + response
+            await message.edit(content=content[:MESSAGE_CONTENT_LIMIT])
+            for start in range(MESSAGE_CONTENT_LIMIT, len(content), MESSAGE_CONTENT_LIMIT):
+                await interaction.followup.send(content[start:start + MESSAGE_CONTENT_LIMIT])
+        except Exception as e:
+            logger.error(f"Error during {noun} for last {n} messages: {e}")
+            await interaction.followup.send(error_message, ephemeral=True)
+
+    async def _simplify(self, interaction: discord.Interaction, n: Optional[int]):
+        await self._rewrite_messages(
+            interaction, n,
+            verb="simplify",
+            noun="simplification",
+            prompt_template=SIMPLIFY_PROMPT,
+            heading="Simplified for a non-technical audience",
+            error_message="Sorry, an error occurred while trying to simplify the messages. Please try again later.",
+        )
 
-        if not messages:
-            await interaction.followup.send("There are no messages to simplify in this channel.", ephemeral=True)
-            return
-            
-        formatted_messages = "\n".join([f"{msg.author.display_name}: {msg.content}" for msg in messages])
-
-        prompt = (
-            "You are an expert communicator who excels at explaining complex technical topics to a non-technical audience. "
-            "Simplify the following Discord chat messages. Your task is to rephrase the conversation, "
-            "explaining any jargon, acronyms, or complex technical concepts in very simple, easy-to-understand terms. "
-            "The goal is to make the entire conversation accessible to someone with absolutely no technical background. "
-            "Focus on clarity and simplicity over technical accuracy if a trade-off is needed. Please use as little lines as possible. Don't add an introduction or a conclusion. Assume that the reader is already familiar with the context. Assume that blank lines are images. Do not try to parse the image, simply ignore it and state that it is an image."
-            f"---BEGIN MESSAGES---\n{formatted_messages}\n---END MESSAGES---"
+    @app_commands.command(name="translate", description="Translates the last n messages in the channel to English.")
+    @app_commands.describe(n="The number of recent messages to translate (1-50, default: 15).")
+    async def translate(self, interaction: discord.Interaction, n: Optional[int]):
+        """Translates the last n messages to English, understanding informal language."""
+        await self._rewrite_messages(
+            interaction, n,
+            verb="translate",
+            noun="translation",
+            prompt_template=TRANSLATE_PROMPT,
+            heading="English Translation",
+            error_message="Sorry, an error occurred while trying to translate. The AI service may be unavailable.",
         )
 
-        try:
-            simplification = await self.ai_service.generate_response(prompt)
-            await interaction.followup.send(f"**Simplified for a non-technical audience:**\n{simplification}")
-        except Exception as e:
-            logger.error(f"Error during simplification for last {n} messages: {e}")
-            await interaction.followup.send("Sorry, an error occurred while trying to simplify the messages. Please try again later.", ephemeral=True)
+    @app_commands.command(name="noalien", description="Simplifies the last n messages for non-technical people.")
+    @app_commands.describe(n="The number of recent messages to simplify (1-50, default: 15).")
+    async def noalien(self, interaction: discord.Interaction, n: Optional[int]):
+        """Simplifies technical jargon from the last n messages."""
+        await self._simplify(interaction, n)
 
     @app_commands.command(name="laymanize", description="Alias for /noalien. Simplifies messages for non-technical people.")
     @app_commands.describe(n="The number of recent messages to simplify (1-50, default: 15).")
     async def laymanize(self, interaction: discord.Interaction, n: Optional[int]):
         """Alias for /noalien."""
-        await self.noalien(interaction, n)
-
+        await self._simplify(interaction, n)
 
 async def setup(bot: commands.Bot):
     """Sets up the Translator cog."""
@@ -1,17 +1,18 @@
 """Default configuration for the bot."""
 from typing import Dict, Any
 
+# The single source of per-guild defaults. ConfigCache fills in any of these keys
+# missing from a stored config, and code that reads a config which may not exist
+# yet falls back to these values instead of repeating literals. Writers send only
+# the fields they change, so filled-in defaults never end up stored in Firestore.
 DEFAULT_CONFIG: Dict[str, Any] = {
     'timezone': 'UTC',
     'dsm_time': '09:00',
     'dsm_channel_id': None,
     'dsm_channel_ids': [],
     'dsm_status_channel_id': None,
-    'google_ai_api_key': None,  # Google AI Studio API key
-    'skipped_dates': [],
-    'admins': [],
-    'dsm_messages': {},
-    'updated_participants': [],
-    'pending_participants': [],
+    'skipped_dates': {},  # {YYYY-MM-DD: True} map of dates DSM is skipped
+    'admin_users': [],
+    'excluded_users': {},  # {user_id: True} map of users left out of DSM
     'dsm_lookback_hours': 2,  # Hours before DSM to include in task collection
-}
\ No newline at end of file
+}
@@ -5,6 +5,9 @@ from typing import Dict, Any
 class Task:
     """Task model for representing tasks in the standup system."""
     
+    # Fixed attributes without a per-instance __dict__; load_tasks can build thousands of these
+    __slots__ = ('description', 'status', 'remarks', 'task_id', 'created_at', 'completed_at')
+    
     def __init__(self, description: str, status: str = "todo", remarks: str = None, task_id: str = None):
         """Initialize a new task.
         
@@ -46,12 +49,12 @@ class Task:
         Returns:
             Task: A new task instance
         """
-        task = cls(
-            description=data['description'],
-            status=data.get('status', 'todo'),
-            remarks=data.get('remarks'),
-            task_id=data.get('task_id')
-        )
-        task.created_at = data.get('created_at', datetime.now().isoformat())
+        # Skip __init__ so the current time is only formatted for data without created_at
+        task = cls.__new__(cls)
+        task.description = data['description']
+        task.status = data.get('status', 'todo')
+        task.remarks = data.get('remarks')
+        task.task_id = data.get('task_id')
+        task.created_at = data['created_at'] if 'created_at' in data else datetime.now().isoformat()
         task.completed_at = data.get('completed_at')  # Load completed_at from data
         return task 
\ No newline at end of file
@@ -1 +1,13 @@
-"""Services package for the bot.""" 
\ No newline at end of file
+"""Services package for the bot."""
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_firebase_service():
+    """Return the FirebaseService shared by every cog, creating it on first use.
+
+    Reloading a cog reuses the same client instead of parsing the credentials
+    and opening another gRPC channel.
+    """
+    from services.firebase_service import FirebaseService
+    return FirebaseService()
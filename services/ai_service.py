@@ -1,15 +1,63 @@
 """AI service for the bot."""
+import asyncio
+import hashlib
 import os
+import time
+from collections import OrderedDict
 from dotenv import load_dotenv
 import json # For JSON operations
 import aiohttp # Async HTTP client
-from typing import Optional, Dict, Any
+from typing import AsyncIterator, Optional, Dict, Any
 
 from utils.logging_util import get_logger
 load_dotenv()
 
 logger = get_logger("ai_service")
 
+# Seconds a generated response is reused for an identical request
+RESPONSE_CACHE_TTL = 3600.0
+# Maximum number of responses kept in memory
+RESPONSE_CACHE_SIZE = 512
+
+# Seconds allowed to open a connection to Gemini
+CONNECT_TIMEOUT = 10
+# Seconds a whole non-streamed request may take, aiohttp's default
+REQUEST_TIMEOUT = 300
+# Seconds a streamed response may go without new data; there is no cap on its total length
+STREAM_READ_TIMEOUT = 60
+
+# Prompt prefixes: the fixed instructions come first and the task JSON is appended
+# last, so Gemini can reuse the shared prefix across calls
+ANALYZE_TASKS_PROMPT = (
+    "Analyze the following tasks and provide insights.\n"
+    "Please provide:\n"
+    "1. Task completion rate\n"
+    "2. Common patterns or themes\n"
+    "3. Potential blockers or challenges\n"
+    "4. Suggestions for improvement\n"
+    "Tasks: "
+)
+
+TASK_SUMMARY_PROMPT = (
+    "Generate a concise summary of the following tasks.\n"
+    "Please provide:\n"
+    "1. Overall progress\n"
+    "2. Key achievements\n"
+    "3. Main challenges\n"
+    "4. Next steps\n"
+    "Tasks: "
+)
+
+TASK_IMPROVEMENTS_PROMPT = (
+    "Analyze this task and suggest improvements.\n"
+    "Please provide:\n"
+    "1. Task clarity assessment\n"
+    "2. Potential improvements\n"
+    "3. Best practices\n"
+    "4. Risk mitigation suggestions\n"
+    "Task: "
+)
+
 class AIService:
     """Service for handling AI-related functionality."""
     def __init__(self):
@@ -17,16 +65,52 @@ class AIService:
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models"
         self.model = "gemini-2.5-flash"
         self.api_key = None
+        # One session for every request so TLS connections to Gemini are kept alive and reused
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Caps Gemini requests in flight so a burst of calls doesn't run into rate limits
+        self.max_concurrency = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Exact-match response cache: request hash -> (monotonic time, response), oldest first
+        self._cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        # Nothing is awaited between the check and the assignment, so concurrent callers can't create two
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=20, limit_per_host=self.max_concurrency, ttl_dns_cache=300, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT))
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
     
     def set_api_key(self, api_key: str):
         """Set the API key for Google AI Studio."""
         self.api_key = os.getenv("GEMINI_API_KEY")
     
     async def generate_response(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
-        """Generate a response using Google AI Studio."""
+        """Generate a response using Google AI Studio.
+
+        Identical requests (same model, prompt and context) within
+        RESPONSE_CACHE_TTL are answered from memory without calling Gemini.
+        """
         if not self.api_key:
             raise ValueError("API key not set. Please set the API key first.")
         
+        cache_key = hashlib.sha256(
+            json.dumps({"m": self.model, "p": prompt, "c": context}, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        cached = self._cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < RESPONSE_CACHE_TTL:
+            self._cache.move_to_end(cache_key)
+            self.stats['hits'] += 1
+            return cached[1]
+        self.stats['misses'] += 1
+        
         try:
             url = f"{self.base_url}/{self.model}:generateContent?key={self.api_key}"
             
@@ -43,11 +127,11 @@ class AIService:
             if context:
                 payload["contents"][0]["parts"][0]["text"] = f"Context: {json.dumps(context)}\n\nPrompt: {prompt}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
+            async with self._semaphore:
+                async with self._get_session().post(url, json=payload) as response:
                     if response.status == 200:
                         data = await response.json()
-                        return data["candidates"][0]["content"]["parts"][0]["text"]
+                        text = data["candidates"][0]["content"]["parts"][0]["text"]
                     else:
                         error_data = await response.json()
                         raise Exception(f"API Error: {error_data.get('error', {}).get('message', 'Unknown error')}")
@@ -55,20 +139,57 @@ class AIService:
         except Exception as e:
             logger.error(f"Error generating AI response: {str(e)}")
             raise
+        
+        self._cache[cache_key] = (time.monotonic(), text)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > RESPONSE_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return text
+    
+    async def stream_response(self, prompt: str) -> AsyncIterator[str]:
+        """Yield a response from Google AI Studio in pieces as it is generated."""
+        if not self.api_key:
+            raise ValueError("API key not set. Please set the API key first.")
+        
+        try:
+            # alt=sse returns one JSON chunk per "data:" line instead of a single JSON array
+            url = f"{self.base_url}/{self.model}:streamGenerateContent?alt=sse&key={self.api_key}"
+            payload = {
+                "contents": [{
+                    "parts": [{
+                        "text": prompt
+                    }]
+                }]
+            }
+            
+            # Long responses keep streaming past REQUEST_TIMEOUT; only a stalled stream times out
+            stream_timeout = aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT, sock_read=STREAM_READ_TIMEOUT)
+            
+            # The slot is held until the stream ends, since the request is in flight until then
+            async with self._semaphore:
+                async with self._get_session().post(url, json=payload, timeout=stream_timeout) as response:
+                    if response.status != 200:
+                        error_data = await response.json()
+                        raise Exception(f"API Error: {error_data.get('error', {}).get('message', 'Unknown error')}")
+                    async for line in response.content:
+                        line = line.strip()
+                        if not line.startswith(b"data:"):
+                            continue
+                        data = json.loads(line[len(b"data:"):])
+                        for candidate in data.get("candidates", [])[:1]:
+                            for part in candidate.get("content", {}).get("parts", []):
+                                if part.get("text"):
+                                    yield part["text"]
+        
+        except Exception as e:
+            logger.error(f"Error streaming AI response: {str(e)}")
+            raise
     
     async def analyze_tasks(self, tasks: list) -> Dict[str, Any]:
         """Analyze tasks using AI to provide insights."""
         try:
             # Prepare the prompt
-            prompt = f"""Analyze the following tasks and provide insights:
-            Tasks: {json.dumps(tasks, indent=2)}
-            
-            Please provide:
-            1. Task completion rate
-            2. Common patterns or themes
-            3. Potential blockers or challenges
-            4. Suggestions for improvement
-            """
+            prompt = ANALYZE_TASKS_PROMPT + json.dumps(tasks, indent=2)
             
             response = await self.generate_response(prompt)
             return json.loads(response)
@@ -81,15 +202,7 @@ class AIService:
         """Generate a summary of tasks using AI."""
         try:
             # Prepare the prompt
-            prompt = f"""Generate a concise summary of the following tasks:
-            Tasks: {json.dumps(tasks, indent=2)}
-            
-            Please provide:
-            1. Overall progress
-            2. Key achievements
-            3. Main challenges
-            4. Next steps
-            """
+            prompt = TASK_SUMMARY_PROMPT + json.dumps(tasks, indent=2)
             
             return await self.generate_response(prompt)
         
@@ -101,15 +214,7 @@ class AIService:
         """Suggest improvements for a specific task using AI."""
         try:
             # Prepare the prompt
-            prompt = f"""Analyze this task and suggest improvements:
-            Task: {json.dumps(task, indent=2)}
-            
-            Please provide:
-            1. Task clarity assessment
-            2. Potential improvements
-            3. Best practices
-            4. Risk mitigation suggestions
-            """
+            prompt = TASK_IMPROVEMENTS_PROMPT + json.dumps(task, indent=2)
             
             return await self.generate_response(prompt)
         
@@ -2,12 +2,21 @@ import asyncio
 import datetime
 import pytz
 import logging
-from discord.ext import tasks
+from typing import Optional
+from config.default_config import DEFAULT_CONFIG
+from services.config_cache import ConfigCache
+from utils.time_util import get_timezone
+
+# Seconds a config stays cached when the service keeps its own cache; longer than the
+# 60 s poll so most passes are answered from memory
+AUTO_DSM_CONFIG_TTL = 300.0
 
 class AutoDSMService:
-    def __init__(self, bot, firebase_service, create_dsm_callback):
+    def __init__(self, bot, firebase_service, create_dsm_callback, config_cache: Optional[ConfigCache] = None):
         self.bot = bot
         self.firebase_service = firebase_service
+        # Pass the DSM cog's cache to see its writes immediately; otherwise changes show up within the TTL
+        self.config_cache = config_cache or ConfigCache(firebase_service, ttl=AUTO_DSM_CONFIG_TTL)
         self.create_dsm_callback = create_dsm_callback  # Should be an async function: (channel, config, is_automatic)
         self.logger = logging.getLogger("auto_dsm_service")
         self.task = None
@@ -23,8 +32,9 @@ class AutoDSMService:
             try:
                 current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 self.logger.info(f"[{current_time}] AutoDSMService running...")
-                for guild in self.bot.guilds:
-                    config = await self.firebase_service.get_config(guild.id)
+                guilds = list(self.bot.guilds)
+                configs = await self.config_cache.get_configs(guild.id for guild in guilds)
+                for guild, config in zip(guilds, configs):
                     if not config:
                         self.logger.debug(f"No config found for guild {guild.id}")
                         continue
@@ -32,9 +42,9 @@ class AutoDSMService:
                     if not dsm_time:
                         self.logger.debug(f"No DSM time configured for guild {guild.id}")
                         continue
-                    tz_str = config.get('timezone', 'UTC')
+                    tz_str = config.get('timezone', DEFAULT_CONFIG['timezone'])
                     try:
-                        tz = pytz.timezone(tz_str)
+                        tz = get_timezone(tz_str)
                     except pytz.exceptions.UnknownTimeZoneError:
                         self.logger.error(f"Invalid timezone {tz_str} for guild {guild.id}, defaulting to UTC")
                         tz = pytz.UTC
@@ -55,6 +65,9 @@ class AutoDSMService:
                     time_diff = abs((now - dsm_datetime).total_seconds())
                     if time_diff <= 60:
                         self.logger.info(f"Time check passed for guild {guild.id} (difference: {time_diff} seconds)")
+                        # Re-read before firing: a cached copy may predate today's latest_dsm_thread
+                        self.config_cache.invalidate(guild.id)
+                        config = await self.config_cache.get_config(guild.id) or config
                         latest_dsm = config.get('latest_dsm_thread', {})
                         if isinstance(latest_dsm, dict):
                             latest_date = latest_dsm.get('date')
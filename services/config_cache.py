@@ -0,0 +1,328 @@
+"""In-process cache for guild configs stored in Firebase."""
+import asyncio
+import copy
+import time
+import weakref
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+from utils.logging_util import get_logger
+
+logger = get_logger("config_cache")
+
+# Seconds a cached guild config stays fresh before the next read goes to Firestore
+DEFAULT_CONFIG_TTL = 60.0
+# Maximum number of guild configs kept in memory
+DEFAULT_CONFIG_CACHE_SIZE = 1024
+# Most Firestore reads get_configs keeps in flight at once
+DEFAULT_MAX_CONCURRENT_READS = 10
+# Seconds queued updates wait so that bursts for the same guild become one Firestore write
+DEFAULT_WRITE_DELAY = 1.0
+
+
+class ConfigCache:
+    """TTL + LRU cache in front of FirebaseService.get_config/update_config."""
+
+    def __init__(self, firebase_service, ttl: float = DEFAULT_CONFIG_TTL, maxsize: int = DEFAULT_CONFIG_CACHE_SIZE,
+                 write_delay: float = DEFAULT_WRITE_DELAY, defaults: Optional[Mapping[str, Any]] = None):
+        """Initialize the cache.
+
+        Args:
+            firebase_service: The FirebaseService used for reads and writes
+            ttl: Seconds before a cached config is refetched
+            maxsize: Maximum number of guilds kept in the cache
+            write_delay: Seconds queued updates are held before being flushed
+            defaults: Values filled in for keys missing from a fetched config
+        """
+        self.firebase_service = firebase_service
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.write_delay = write_delay
+        self.defaults = defaults or {}
+        # Updates queued by schedule_update, merged per guild until the next flush
+        self._pending_writes: Dict[int, Dict[str, Any]] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+        self._entries: "OrderedDict[int, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Only guilds with a fetch in progress hold a lock; idle ones are dropped automatically
+        self._locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # Keeps write_behind calls for a guild in order, so an older write can't land last
+        self._write_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+        # Background writes started by write_behind, awaited by flush_all
+        self._write_tasks: Set[asyncio.Task] = set()
+        # Per guild, the write_behind batch still waiting for its turn and the task that will send it
+        self._write_batches: Dict[int, Tuple[Dict[str, Any], asyncio.Task]] = {}
+        # Per guild, writes not yet confirmed by Firestore, oldest first: write_behind batches
+        # (queued or in flight) and update_config writes in flight
+        self._unconfirmed_writes: Dict[int, List[Dict[str, Any]]] = {}
+        # Per guild with a Firestore read in flight, the writes started since it began
+        self._writes_during_fetch: Dict[int, List[Dict[str, Any]]] = {}
+        # Frozensets derived from cached list fields, dropped whenever the config changes
+        self._id_sets: Dict[Tuple[int, str], FrozenSet[str]] = {}
+
+    def _get_fresh(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Return the cached config if present and not expired."""
+        entry = self._entries.get(guild_id)
+        if entry is None:
+            return None
+        fetched_at, config = entry
+        if time.monotonic() - fetched_at >= self.ttl:
+            del self._entries[guild_id]
+            return None
+        self._entries.move_to_end(guild_id)
+        return config
+
+    def _store(self, guild_id: int, config: Dict[str, Any]) -> None:
+        """Insert a config, evicting the least recently used guild when full."""
+        self._entries[guild_id] = (time.monotonic(), config)
+        self._clear_id_sets(guild_id)
+        self._entries.move_to_end(guild_id)
+        while len(self._entries) > self.maxsize:
+            evicted_guild_id, _ = self._entries.popitem(last=False)
+            self._clear_id_sets(evicted_guild_id)
+
+    async def get_config(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get a shallow copy of a guild config that callers may modify before writing back.
+
+        Top-level assignments stay local until passed to update_config. Nested
+        dicts and lists are shared with the cache, so mutate them only on the
+        way to a write; a failed write invalidates the entry.
+        """
+        config = await self._get_cached(guild_id)
+        return dict(config) if config is not None else None
+
+    async def get_config_view(self, guild_id: int) -> Mapping[str, Any]:
+        """Get a read-only view of a guild config without copying it."""
+        config = await self._get_cached(guild_id)
+        return MappingProxyType(config if config is not None else {})
+
+    async def _get_cached(self, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Return the shared cached config, reading from Firestore only on a miss or after the TTL."""
+        config = self._get_fresh(guild_id)
+        if config is not None:
+            return config
+
+        # One fetch per guild at a time; concurrent callers wait and reuse the result.
+        async with self._get_lock(self._locks, guild_id):
+            config = self._get_fresh(guild_id)
+            if config is not None:
+                return config
+            # Writes that finish while the read is in flight may or may not be in its result,
+            # including ones that start and land entirely during it
+            unconfirmed = list(self._unconfirmed_writes.get(guild_id, ()))
+            started = self._writes_during_fetch[guild_id] = []
+            try:
+                config = await self.firebase_service.get_config(guild_id)
+            finally:
+                del self._writes_during_fetch[guild_id]
+            if config is not None:
+                # Copied so that guilds never share a default list or map
+                for key, value in self.defaults.items():
+                    if key not in config:
+                        config[key] = copy.deepcopy(value)
+                # Writes unconfirmed when the read began or started during it are newer than what Firestore returned
+                for batch in unconfirmed + started:
+                    config.update(batch)
+                # Queued updates are newer than what Firestore returned
+                config.update(self._pending_writes.get(guild_id, {}))
+                self._store(guild_id, config)
+            return config
+
+    async def get_configs(self, guild_ids: Iterable[int],
+                          max_concurrency: int = DEFAULT_MAX_CONCURRENT_READS) -> List[Optional[Dict[str, Any]]]:
+        """Get shallow copies of several guild configs, reading cache misses concurrently.
+
+        At most max_concurrency reads run at once so a large bot doesn't burst
+        past the Firestore quota. Results are in the order of guild_ids; a guild
+        whose read fails gets None.
+        """
+        guild_ids = list(guild_ids)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _get_bounded(guild_id: int) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_config(guild_id)
+
+        results = await asyncio.gather(*(_get_bounded(guild_id) for guild_id in guild_ids), return_exceptions=True)
+        configs: List[Optional[Dict[str, Any]]] = []
+        for guild_id, result in zip(guild_ids, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading config for guild {guild_id}: {result}")
+                result = None
+            configs.append(result)
+        return configs
+
+    @staticmethod
+    def _get_lock(locks: "weakref.WeakValueDictionary[int, asyncio.Lock]", guild_id: int) -> asyncio.Lock:
+        lock = locks.get(guild_id)
+        if lock is None:
+            lock = locks[guild_id] = asyncio.Lock()
+        return lock
+
+    def write_behind(self, guild_id: int, updates: Dict[str, Any]) -> asyncio.Task:
+        """Apply updates to the cached config now and write them to Firestore in the background.
+
+        Unlike schedule_update the write starts right away, and writes for the
+        same guild reach Firestore in the order they were made. Calls made while
+        an earlier write for the guild is still waiting join it, so a burst of
+        commands costs one Firestore write; they share the returned task. If the
+        write fails the cached entry is invalidated, so the next read shows what
+        was actually stored, and the task raises the error.
+        """
+        config = self._get_fresh(guild_id)
+        if config is not None and config is not updates:
+            config.update(updates)
+        self._clear_id_sets(guild_id)
+
+        batch = self._write_batches.get(guild_id)
+        if batch is not None:
+            batch[0].update(updates)
+            return batch[1]
+
+        batch_updates = dict(updates)
+        task = asyncio.create_task(self._write_in_order(guild_id, batch_updates))
+        self._write_batches[guild_id] = (batch_updates, task)
+        self._track_unconfirmed(guild_id, batch_updates)
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+        return task
+
+    async def _write_in_order(self, guild_id: int, updates: Dict[str, Any]) -> None:
+        async with self._get_lock(self._write_locks, guild_id):
+            # Later calls now start a new batch behind this one
+            self._write_batches.pop(guild_id, None)
+            try:
+                await self.update_config(guild_id, updates)
+            except Exception:
+                # A read that started before the failure may still hold this batch; emptying
+                # it keeps the rejected change out of the refetched config
+                updates.clear()
+                raise
+            finally:
+                self._untrack_unconfirmed(guild_id, updates)
+
+    def _track_unconfirmed(self, guild_id: int, updates: Dict[str, Any]) -> None:
+        """Record a write that a config read in flight may not see yet."""
+        self._unconfirmed_writes.setdefault(guild_id, []).append(updates)
+        started = self._writes_during_fetch.get(guild_id)
+        if started is not None:
+            started.append(updates)
+
+    def _untrack_unconfirmed(self, guild_id: int, updates: Dict[str, Any]) -> None:
+        """Forget a write once Firestore has accepted or rejected it."""
+        unconfirmed = self._unconfirmed_writes.get(guild_id, [])
+        for index, batch in enumerate(unconfirmed):
+            if batch is updates:
+                del unconfirmed[index]
+                break
+        if not unconfirmed:
+            self._unconfirmed_writes.pop(guild_id, None)
+
+    async def update_config(self, guild_id: int, updates: Dict[str, Any]) -> None:
+        """Write updates to Firestore and apply them to the cached config.
+
+        Updates queued by schedule_update for the guild ride along in the same
+        write, so a handler that marks participation and then saves settings
+        costs one Firestore call.
+        """
+        # Fields in this write supersede queued values for the same fields
+        pending = self._pending_writes.pop(guild_id, None)
+        if pending:
+            for field in updates:
+                pending.pop(field, None)
+        write = {**pending, **updates} if pending else dict(updates)
+
+        # A read that starts before this write lands would otherwise cache the old document for a full TTL
+        self._track_unconfirmed(guild_id, write)
+        try:
+            await self.firebase_service.update_config(guild_id, write)
+        except Exception:
+            # Keeps the rejected change out of a config a read in flight is about to cache
+            write.clear()
+            if pending:
+                # Put the queued updates back so a later flush still writes them
+                self._pending_writes.setdefault(guild_id, {}).update(pending)
+                self._ensure_flush_task(guild_id)
+            self.invalidate(guild_id)
+            raise
+        finally:
+            self._untrack_unconfirmed(guild_id, write)
+
+        config = self._get_fresh(guild_id)
+        if config is not None and config is not updates:
+            config.update(updates)
+        self._clear_id_sets(guild_id)
+
+    def schedule_update(self, guild_id: int, updates: Dict[str, Any]) -> None:
+        """Apply updates to the cached config now and write them to Firestore shortly after.
+
+        Updates queued for the same guild within write_delay are merged and sent
+        as one update_config call.
+        """
+        config = self._get_fresh(guild_id)
+        if config is not None and config is not updates:
+            config.update(updates)
+        self._clear_id_sets(guild_id)
+
+        self._pending_writes.setdefault(guild_id, {}).update(updates)
+        self._ensure_flush_task(guild_id)
+
+    def _ensure_flush_task(self, guild_id: int) -> None:
+        task = self._flush_tasks.get(guild_id)
+        if task is None or task.done():
+            self._flush_tasks[guild_id] = asyncio.create_task(self._flush_later(guild_id))
+
+    async def _flush_later(self, guild_id: int) -> None:
+        await asyncio.sleep(self.write_delay)
+        await self.flush(guild_id)
+
+    async def flush(self, guild_id: int) -> None:
+        """Write a guild's queued updates to Firestore now."""
+        updates = self._pending_writes.pop(guild_id, None)
+        if not updates:
+            return
+        try:
+            await self.firebase_service.update_config(guild_id, updates)
+        except Exception as e:
+            logger.error(f"Error flushing queued config updates for guild {guild_id}: {e}")
+            self.invalidate(guild_id)
+
+    async def flush_all(self) -> None:
+        """Write every guild's queued updates, e.g. before shutdown."""
+        for task in self._flush_tasks.values():
+            task.cancel()
+        self._flush_tasks.clear()
+        for guild_id in list(self._pending_writes):
+            await self.flush(guild_id)
+        if self._write_tasks:
+            # Failures were already reported through the tasks themselves
+            await asyncio.gather(*self._write_tasks, return_exceptions=True)
+
+    async def get_id_set(self, guild_id: int, field: str) -> FrozenSet[str]:
+        """Return a field of IDs as a frozenset of strings.
+
+        Works for list fields (admin_users) and {id: True} map fields
+        (excluded_users), since iterating a map yields its keys.
+
+        The set is built once per cached config, so repeated membership checks
+        are O(1) without changing the shape stored in Firestore.
+        """
+        key = (guild_id, field)
+        id_set = self._id_sets.get(key)
+        if id_set is not None and self._get_fresh(guild_id) is not None:
+            return id_set
+        config = await self._get_cached(guild_id) or {}
+        id_set = frozenset(map(str, config.get(field) or ()))
+        self._id_sets[key] = id_set
+        return id_set
+
+    def _clear_id_sets(self, guild_id: int) -> None:
+        """Drop derived ID sets for a guild."""
+        for key in [key for key in self._id_sets if key[0] == guild_id]:
+            del self._id_sets[key]
+
+    def invalidate(self, guild_id: int) -> None:
+        """Drop a guild's cached config so the next read goes to Firestore."""
+        self._clear_id_sets(guild_id)
+        if self._entries.pop(guild_id, None) is not None:
+            logger.debug(f"Invalidated cached config for guild {guild_id}")
@@ -0,0 +1,17 @@
+"""Memoized time helpers shared by the DSM cog and services."""
+import datetime
+import functools
+
+import pytz
+
+
+@functools.lru_cache(maxsize=256)
+def parse_iso_datetime(value: str) -> datetime.datetime:
+    """Parse an ISO timestamp from config, memoized since the same value is read on every event."""
+    return datetime.datetime.fromisoformat(value)
+
+
+@functools.lru_cache(maxsize=64)
+def get_timezone(name: str) -> pytz.BaseTzInfo:
+    """Resolve a timezone name once; pytz normalizes and validates the name on every call."""
+    return pytz.timezone(name)